@@ -0,0 +1,29 @@
+"""
+Motor de regras do Jogo de Damas, sem dependência do pygame.
+
+A posição é representada por bitboards (ver bitboard.py) e GameState expõe
+a mesma interface de regras usada pela classe Game da interface gráfica.
+O pacote não importa o pygame, podendo ser usado em testes, processos de
+trabalho ou servidores sem abrir uma janela.
+"""
+
+from .ai import choose_turn, score_turn
+from .background import BackgroundSearch
+from .book import OpeningBook
+from .bitboard import BLUE, PINK, PLAYERS, Position, SQUARE_TO_RC, popcount, square_of
+from .movegen import Turn, attacked_pieces, capture_moves, generate_turns, legal_moves, normal_moves
+from .evaluate import evaluate
+from .ordering import MoveOrderer
+from .profiler import FrameProfiler
+from .search import SearchResult, Searcher
+from .state import GameState
+from .tablebase import Tablebase
+from .tt import TranspositionTable
+
+
+def __getattr__(name):
+    # parallel.py importa o multiprocessing, que pesa na abertura do jogo: só é carregado quando usado
+    if name == 'ParallelSearcher':
+        from .parallel import ParallelSearcher
+        return ParallelSearcher
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
@@ -0,0 +1,66 @@
+"""
+Jogador guloso: escolhe um turno completo olhando apenas um lance adiante.
+
+Era a IA original do jogo; a IA atual usa a busca de search.py, e este jogador
+continua disponível como adversário de referência, mais rápido e mais fraco.
+"""
+
+from .bitboard import SQUARE_TO_RC, popcount
+from .movegen import attacked_pieces, generate_turns
+
+CENTER_COLS = frozenset((2, 3, 4, 5))
+
+
+def score_turn(position, turn):
+    """
+    Pontuação de um turno do lado a jogar: capturas, saltos encadeados, promoção,
+    avanço, controle central e segurança das peças após o turno.
+    """
+    side = position.side
+    dest_row, dest_col = SQUARE_TO_RC[turn.path[-1]]
+
+    score = 0
+    if turn.captured:
+        score += 100 * len(turn.captured) # Grande bônus para cada peça capturada
+        score += 500 * (len(turn.captured) - 1) # Bônus ainda maior para cada salto encadeado
+
+    if turn.promotes:
+        score += 200 # Alto bônus por se tornar uma dama
+
+    # Valor posicional - prioriza mover para o lado do oponente ou centro
+    if side: # Rosas movem para baixo (linhas maiores)
+        score += dest_row * 5 # Mais pontos para linhas mais avançadas
+    else: # Azuis movem para cima (linhas menores)
+        score += (7 - dest_row) * 5 # Mais pontos para linhas mais avançadas
+
+    # Controle central
+    if dest_col in CENTER_COLS:
+        score += 5
+
+    # Verificação de segurança (evitar captura imediata pelo oponente): o mapa de ataque
+    # do oponente é calculado uma única vez, com o turno aplicado no próprio tabuleiro
+    previous_state = position.play(turn)
+    attacked = attacked_pieces(position, position.side)
+    position.restore(previous_state)
+    landing_bit = 1 << turn.path[-1]
+    if attacked & landing_bit:
+        score -= 150 # Penalidade significativa por pousar em um local perigoso
+    score -= 30 * popcount(attacked & ~landing_bit) # Penalidade menor por cada outra peça ameaçada
+    return score
+
+
+def choose_turn(position, turns=None):
+    """
+    Melhor turno do lado a jogar segundo score_turn (o primeiro, em caso de empate),
+    ou None se não houver turnos. turns restringe a escolha a uma lista já gerada.
+    """
+    if turns is None:
+        turns = generate_turns(position)
+    best_turn = None
+    best_score = -float('inf')
+    for turn in turns:
+        score = score_turn(position, turn)
+        if score > best_score:
+            best_score = score
+            best_turn = turn
+    return best_turn
@@ -0,0 +1,127 @@
+"""
+Busca da IA em segundo plano.
+
+BackgroundSearch roda a busca numa thread e entrega o resultado por uma fila,
+para que o laço da interface continue desenhando e tratando eventos enquanto
+o computador pensa. PonderSearch usa o tempo do humano para adiantar as respostas.
+As threads trabalham sobre uma cópia da posição. Um mesmo searcher não pode buscar
+em duas threads ao mesmo tempo: a busca seguinte recebe em after a anterior, e a
+sua thread espera a anterior terminar antes de começar (sem travar a interface).
+Por isso o cancelamento usa um evento de cada busca, passado ao searcher em cancel,
+e não searcher.stop(): um pedido feito enquanto a thread ainda espera a anterior
+também precisa valer quando a busca começar.
+"""
+
+import queue
+import threading
+
+from .movegen import generate_turns
+from .search import DEFAULT_TIME_LIMIT_MS, MAX_DEPTH
+
+
+class BackgroundSearch:
+    """Uma busca de searcher sobre position, iniciada na criação e consultada com poll()."""
+
+    def __init__(self, searcher, position, time_limit_ms=DEFAULT_TIME_LIMIT_MS, turns=None, max_depth=MAX_DEPTH,
+                 after=None):
+        self.searcher = searcher
+        self.key = position.key # Chave da posição buscada, para conferir se o resultado ainda vale
+        self._results = queue.Queue(maxsize=1)
+        self._result = None
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(position.copy(), time_limit_ms, turns, max_depth, after), name='damas-search',
+            daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, position, time_limit_ms, turns, max_depth, after):
+        if after is not None:
+            after.wait() # A busca anterior ainda pode estar usando o searcher
+        if self._cancelled.is_set():
+            return # Cancelada antes de começar: não há resultado
+        self._results.put(self.searcher.search(position, time_limit_ms, max_depth, turns=turns,
+                                               cancel=self._cancelled))
+
+    def poll(self):
+        """SearchResult da busca, ou None se ela ainda não terminou. Não bloqueia."""
+        if self._result is None:
+            try:
+                self._result = self._results.get_nowait()
+            except queue.Empty:
+                return None
+        return self._result
+
+    def wait(self, timeout=None):
+        """
+        Espera a busca terminar e retorna o seu SearchResult (None se o tempo acabar antes
+        ou se ela foi cancelada antes de começar).
+        """
+        self._thread.join(timeout)
+        return self.poll()
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def cancel(self):
+        """
+        Pede para a busca terminar o quanto antes, mesmo que ela ainda não tenha começado;
+        o resultado parcial pode ser ignorado.
+        """
+        self._cancelled.set()
+
+
+class PonderSearch:
+    """
+    Pondering: enquanto o humano pensa, busca as respostas do computador às jogadas
+    mais prováveis dele, na ordem dada pelo MoveOrderer do searcher (se houver), uma
+    de cada vez e com time_limit_ms cada. Os resultados ficam guardados pela chave da
+    posição após a jogada do humano; o trabalho também fica na tabela de transposição.
+    """
+
+    def __init__(self, searcher, position, time_limit_ms=DEFAULT_TIME_LIMIT_MS, after=None):
+        self.searcher = searcher
+        self.results = {} # {chave da posição após a jogada do humano: SearchResult}
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, args=(position.copy(), time_limit_ms, after), name='damas-ponder', daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, position, time_limit_ms, after):
+        if after is not None:
+            after.wait()
+        turns = list(generate_turns(position))
+        ordering = getattr(self.searcher, 'ordering', None)
+        if ordering is not None:
+            turns = ordering.order(position, turns)
+        for turn in turns:
+            if self._stopped.is_set():
+                return
+            previous_state = position.play(turn)
+            result = self.searcher.search(position, time_limit_ms, cancel=self._stopped)
+            key = position.key
+            position.restore(previous_state)
+            if self._stopped.is_set():
+                return # Busca interrompida no meio: o resultado é incompleto
+            with self._lock:
+                self.results[key] = result
+
+    def stop(self):
+        """
+        Interrompe o pondering sem esperar: a busca em andamento termina na próxima consulta
+        ao relógio. Quem for usar o searcher em seguida deve esperar por wait() (ou receber
+        este objeto em after).
+        """
+        self._stopped.set()
+
+    def wait(self, timeout=None):
+        """Espera a thread terminar, liberando o searcher."""
+        self._thread.join(timeout)
+
+    def result_for(self, key):
+        """Resultado guardado para a posição de chave key, ou None se ela não foi examinada."""
+        with self._lock:
+            return self.results.get(key)
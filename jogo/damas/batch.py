@@ -0,0 +1,330 @@
+"""
+Avaliação e geração de movimentos de posições em lote com NumPy.
+
+Um lote de N posições é representado como uma matriz (N, 32) de int8, uma coluna
+por casa jogável (ver bitboard.py), com os valores abaixo (positivos para as azuis,
+negativos para as rosas), mais um vetor com o lado a jogar de cada posição; ou
+em forma compacta, como uma matriz (N, 4) de uint64 com (azuis, rosas, damas, lado).
+
+Todos os termos são calculados de uma só vez para o lote inteiro, sem laços em
+Python por posição, para buscas e análises que avaliam muitas folhas juntas.
+A geração de movimentos em lote trabalha direto sobre a forma compacta, com os
+mesmos deslocamentos e máscaras de bitboard.shift() aplicados a vetores de uint64.
+
+O NumPy é opcional: apenas este módulo depende dele, e o jogo funciona sem ele.
+
+Para comparar com evaluate() e generate_moves() posição a posição (a partir da pasta jogo/):
+    python -m damas.batch --positions 100000
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .bitboard import (
+    BLUE, EVEN_ROWS, FORWARD, FULL_BOARD, NEIGHBOURS, ODD_ROWS, PINK, SQUARE_TO_RC, _SHIFTS, _SOURCES,
+)
+from .evaluate import (
+    ADVANCE_BONUS, BACK_ROW_BONUS, CENTER_BONUS, KING_VALUE, MAN_VALUE, _ADVANCED, _BACK_ROW, _CENTER,
+)
+
+# Valores das casas na matriz (N, 32)
+EMPTY = 0
+BLUE_MAN, BLUE_KING = 1, 2
+PINK_MAN, PINK_KING = -1, -2
+
+MOBILITY_BONUS = 2  # Por movimento simples disponível (pedras para frente, damas ao longo dos raios)
+KING_DIAGONAL_BONUS = 10  # Por dama na grande diagonal, de onde ela controla as duas pontas do tabuleiro
+
+# Grande diagonal: da casa (7, 0) à casa (0, 7)
+_MAIN_DIAGONAL = sum(1 << sq for sq, (row, col) in enumerate(SQUARE_TO_RC) if row + col == 7)
+_OFF_BOARD = 3  # Valor da casa fictícia 32, fora do tabuleiro: conta como ocupada
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('damas.batch requer o NumPy (pip install numpy)')
+
+
+def _bits(mask):
+    return [mask >> sq & 1 for sq in range(32)]
+
+
+if np is not None:
+    _SQUARES = np.arange(32)
+
+    # _TABLE[valor da casa + 2][casa]: material e bônus de casa (as mesmas parcelas de evaluate()),
+    # do ponto de vista das azuis
+    _TABLE = np.zeros((5, 32), dtype=np.int32)
+    _TABLE[BLUE_MAN + 2] = (MAN_VALUE + ADVANCE_BONUS * np.array(_bits(_ADVANCED[BLUE]))
+                            + BACK_ROW_BONUS * np.array(_bits(_BACK_ROW[BLUE]))
+                            + CENTER_BONUS * np.array(_bits(_CENTER)))
+    _TABLE[PINK_MAN + 2] = -(MAN_VALUE + ADVANCE_BONUS * np.array(_bits(_ADVANCED[PINK]))
+                             + BACK_ROW_BONUS * np.array(_bits(_BACK_ROW[PINK]))
+                             + CENTER_BONUS * np.array(_bits(_CENTER)))
+    _TABLE[BLUE_KING + 2] = KING_VALUE + CENTER_BONUS * np.array(_bits(_CENTER))
+    _TABLE[PINK_KING + 2] = -_TABLE[BLUE_KING + 2]
+    _DIAGONAL = np.array(_bits(_MAIN_DIAGONAL), dtype=np.int32)
+
+    # _NEXT[direção][casa]: casa vizinha na direção, ou 32 (fora do tabuleiro); _NEXT[direção][32] = 32
+    _NEXT = np.array([[NEIGHBOURS[sq][direction] if NEIGHBOURS[sq][direction] is not None else 32
+                       for sq in range(32)] + [32] for direction in range(4)])
+
+    # Constantes de bitboard.shift() como uint64, para os deslocamentos sobre vetores
+    _U64_SHIFTS = tuple((np.uint64(even), np.uint64(odd)) for even, odd in _SHIFTS)
+    _U64_SOURCES = tuple(np.uint64(sources) for sources in _SOURCES)
+    _U64_EVEN_ROWS = np.uint64(EVEN_ROWS)
+    _U64_ODD_ROWS = np.uint64(ODD_ROWS)
+    _U64_FULL_BOARD = np.uint64(FULL_BOARD)
+
+    if hasattr(np, 'bitwise_count'):
+        _popcount = np.bitwise_count
+    else: # NumPy anterior à 2.0: soma dos bits de cada byte
+        _BYTE_COUNTS = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+        def _popcount(masks):
+            return _BYTE_COUNTS[masks[..., None].view(np.uint8)].sum(axis=-1)
+
+
+def pack_positions(positions):
+    """Forma compacta de uma sequência de Position: matriz (N, 4) de uint64 com (azuis, rosas, damas, lado)."""
+    _require_numpy()
+    values = [value for position in positions
+              for value in (position.blue, position.pink, position.kings, position.side)]
+    return np.array(values, dtype=np.uint64).reshape(-1, 4)
+
+
+def unpack_boards(packed):
+    """Converte a forma compacta (N, 4) em (matriz (N, 32) de int8, vetor com o lado a jogar)."""
+    _require_numpy()
+    packed = np.asarray(packed, dtype=np.uint64)
+    # Cada bitboard cabe em 32 bits: os seus 4 bytes são separados em bits, do menos significativo
+    masks = np.ascontiguousarray(packed[:, :3], dtype='<u4').view(np.uint8)
+    bits = np.unpackbits(masks, axis=1, bitorder='little').view(np.int8).reshape(-1, 3, 32)
+    blue, pink, kings = bits[:, 0], bits[:, 1], bits[:, 2]
+    return (blue - pink) * (1 + kings), packed[:, 3].astype(np.int8)
+
+
+def boards_from_positions(positions):
+    """(matriz (N, 32) de int8, vetor com o lado a jogar) de uma sequência de Position."""
+    return unpack_boards(pack_positions(positions))
+
+
+def mobility(boards):
+    """
+    Movimentos simples disponíveis (sem considerar capturas) das azuis menos os das rosas,
+    para cada posição: pedras um passo para frente, damas até a primeira casa ocupada de cada raio.
+    """
+    _require_numpy()
+    boards = np.asarray(boards, dtype=np.int8)
+    padded = np.concatenate([boards, np.full((len(boards), 1), _OFF_BOARD, dtype=np.int8)], axis=1)
+    empty = padded == EMPTY
+    result = np.zeros(len(boards), dtype=np.int32)
+    for side, man, sign in ((BLUE, BLUE_MAN, 1), (PINK, PINK_MAN, -1)):
+        men = boards == man
+        for direction in FORWARD[side]:
+            result += sign * np.count_nonzero(men & empty[:, _NEXT[direction][:32]], axis=1)
+    kings = np.abs(boards) == BLUE_KING
+    signs = np.sign(boards).astype(np.int32)
+    for direction in range(4):
+        reach = kings
+        squares = _NEXT[direction][:32]
+        for _ in range(7): # Um raio tem no máximo 7 casas
+            reach = reach & empty[:, squares]
+            if not reach.any():
+                break
+            result += (reach * signs).sum(axis=1)
+            squares = _NEXT[direction][squares]
+    return result
+
+
+def evaluate_boards(boards, sides, mobility_bonus=MOBILITY_BONUS, king_diagonal_bonus=KING_DIAGONAL_BONUS):
+    """
+    Avaliação de cada posição do lote para o lado a jogar: material e bônus de casa
+    (os termos de evaluate()), mobilidade e damas na grande diagonal. Com
+    mobility_bonus=0 e king_diagonal_bonus=0, o resultado é igual ao de evaluate().
+    Retorna um vetor de int32 com N pontuações.
+    """
+    _require_numpy()
+    boards = np.asarray(boards, dtype=np.int8)
+    score = _TABLE[boards + 2, _SQUARES].sum(axis=1, dtype=np.int32)
+    if king_diagonal_bonus:
+        kings = (boards == BLUE_KING).astype(np.int32) - (boards == PINK_KING)
+        score += king_diagonal_bonus * (kings @ _DIAGONAL)
+    if mobility_bonus:
+        score += mobility_bonus * mobility(boards)
+    return np.where(np.asarray(sides) == PINK, -score, score)
+
+
+def evaluate_packed(packed, **bonuses):
+    """evaluate_boards() para um lote na forma compacta (N, 4)."""
+    return evaluate_boards(*unpack_boards(packed), **bonuses)
+
+
+def evaluate_positions(positions, **bonuses):
+    """evaluate_boards() para uma sequência de Position."""
+    return evaluate_boards(*boards_from_positions(positions), **bonuses)
+
+
+def _shift(masks, direction):
+    """bitboard.shift() aplicado a um vetor de máscaras uint64."""
+    even_amount, odd_amount = _U64_SHIFTS[direction]
+    masks = masks & _U64_SOURCES[direction]
+    if direction >= 2: # Para baixo
+        return ((masks & _U64_EVEN_ROWS) << even_amount) | ((masks & _U64_ODD_ROWS) << odd_amount)
+    return ((masks & _U64_EVEN_ROWS) >> even_amount) | ((masks & _U64_ODD_ROWS) >> odd_amount)
+
+
+def move_counts(packed):
+    """
+    Geração de movimentos em lote, para o lado a jogar de cada posição da forma compacta (N, 4).
+    Retorna (mobilidade, capturas): mobilidade é o número de lances legais de um salto,
+    respeitando a captura obrigatória (o mesmo que len(generate_moves(posição))), e
+    capturas indica se há captura disponível. Zero lances significa que o lado a jogar perdeu.
+    As sequências completas de capturas (os turnos) continuam vindo de generate_turns.
+    """
+    _require_numpy()
+    packed = np.asarray(packed, dtype=np.uint64)
+    blue, pink, kings, sides = packed[:, 0], packed[:, 1], packed[:, 2], packed[:, 3]
+    pink_to_move = sides == PINK
+    own = np.where(pink_to_move, pink, blue)
+    opponent = np.where(pink_to_move, blue, pink)
+    empty = ~(own | opponent) & _U64_FULL_BOARD
+    men = own & ~kings
+    own_kings = own & kings
+    zero = np.uint64(0)
+
+    moves = np.zeros(len(packed), dtype=np.int32)
+    captures = np.zeros(len(packed), dtype=np.int32)
+    for direction in range(4):
+        # Pedras: apenas nas direções para frente do lado a jogar de cada posição
+        forward_men = np.where(pink_to_move == (direction >= 2), men, zero)
+        step = _shift(forward_men, direction)
+        moves += _popcount(step & empty)
+        captures += _popcount(_shift(step & opponent, direction) & empty)
+
+        # Damas: deslizam pelas casas livres; a primeira peça do raio, se for do oponente,
+        # pode ser capturada, com pouso em qualquer casa livre depois dela
+        sliding = own_kings
+        captured = zero
+        for _ in range(7): # Um raio tem no máximo 7 casas
+            step = _shift(sliding, direction)
+            captured = captured | (step & opponent)
+            sliding = step & empty
+            if not sliding.any():
+                break
+            moves += _popcount(sliding)
+        landing = _shift(captured, direction) & empty
+        while landing.any():
+            captures += _popcount(landing)
+            landing = _shift(landing, direction) & empty
+
+    has_capture = captures > 0
+    return np.where(has_capture, captures, moves), has_capture
+
+
+def _random_positions(count, seed=0):
+    """count posições de partidas aleatórias a partir da inicial, para o benchmark."""
+    import random
+
+    from .bitboard import Position
+    from .movegen import generate_turns
+
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        position = Position.initial()
+        for _ in range(rng.randint(0, 60)):
+            turns = list(generate_turns(position))
+            if not turns:
+                break
+            position.play(rng.choice(turns))
+        positions.append(position)
+    return positions
+
+
+def _scalar_evaluate(position):
+    """Mesmos termos de evaluate_boards(), calculados posição a posição em Python (referência do benchmark)."""
+    from .bitboard import iter_squares, popcount
+    from .evaluate import evaluate
+    from .movegen import normal_moves
+
+    moves = 0
+    for side, sign in ((BLUE, 1), (PINK, -1)):
+        for sq in iter_squares(position.pieces(side)):
+            moves += sign * len(normal_moves(position, sq, side))
+    kings = (popcount(position.blue & position.kings & _MAIN_DIAGONAL)
+             - popcount(position.pink & position.kings & _MAIN_DIAGONAL))
+    extra = MOBILITY_BONUS * moves + KING_DIAGONAL_BONUS * kings
+    return evaluate(position) + (-extra if position.side else extra)
+
+
+def _benchmark(count):
+    """
+    Compara a avaliação e a geração de movimentos posição a posição com as versões em lote,
+    e confere que os resultados coincidem.
+    """
+    import time
+
+    from .evaluate import evaluate
+    from .movegen import generate_moves
+
+    positions = _random_positions(count)
+
+    start = time.perf_counter()
+    scalar = [evaluate(position) for position in positions]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scalar_full = [_scalar_evaluate(position) for position in positions]
+    scalar_full_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    boards, sides = boards_from_positions(positions)
+    convert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    same_terms = evaluate_boards(boards, sides, mobility_bonus=0, king_diagonal_bonus=0)
+    same_terms_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    full = evaluate_boards(boards, sides)
+    full_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scalar_moves = [len(generate_moves(position)) for position in positions]
+    scalar_moves_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    packed = pack_positions(positions)
+    mobility_counts, _ = move_counts(packed)
+    moves_time = time.perf_counter() - start
+
+    if same_terms.tolist() != scalar:
+        raise AssertionError('a avaliação em lote difere de evaluate()')
+    if full.tolist() != scalar_full:
+        raise AssertionError('a mobilidade ou o termo das damas em lote difere da referência em Python')
+    if mobility_counts.tolist() != scalar_moves:
+        raise AssertionError('a geração de movimentos em lote difere de generate_moves()')
+    print('%d posições' % count)
+    for name, elapsed in (
+        ('evaluate() por posição', scalar_time),
+        ('idem, com mobilidade e damas', scalar_full_time),
+        ('conversão para (N, 32)', convert_time),
+        ('lote, termos de evaluate()', same_terms_time),
+        ('lote, com mobilidade e damas', full_time),
+        ('generate_moves() por posição', scalar_moves_time),
+        ('lote, move_counts() (com conversão)', moves_time),
+    ):
+        print('%-36s %8.1f ms  %6.2f us/posição' % (name, elapsed * 1000, elapsed * 1e6 / count))
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compara a avaliação e a geração de movimentos em lote com as de uma posição por vez.')
+    parser.add_argument('--positions', type=int, default=100000)
+    args = parser.parse_args()
+    _require_numpy()
+    _benchmark(args.positions)
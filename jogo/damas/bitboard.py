@@ -0,0 +1,310 @@
+"""
+Representação do tabuleiro em bitboards.
+
+As 32 casas jogáveis (as casas pretas do tabuleiro) são numeradas de 0 a 31,
+linha por linha, de cima para baixo: casa = linha * 4 + coluna // 2.
+Cada conjunto de peças é um inteiro em que o bit N indica a ocupação da casa N.
+"""
+
+import random
+
+PLAYERS = ('o', 'x')  # Azul (lado 0) joga primeiro, depois rosa (lado 1)
+BLUE = 0
+PINK = 1
+
+FULL_BOARD = (1 << 32) - 1
+EVEN_ROWS = 0x0F0F0F0F  # Linhas 0, 2, 4 e 6 (casas nas colunas ímpares)
+ODD_ROWS = 0xF0F0F0F0   # Linhas 1, 3, 5 e 7 (casas nas colunas pares)
+TOP_ROW = 0x0000000F    # Linha 0: promoção das peças azuis
+BOTTOM_ROW = 0xF0000000 # Linha 7: promoção das peças rosas
+LEFT_EDGE = 0x10101010  # Coluna 0
+RIGHT_EDGE = 0x08080808 # Coluna 7
+
+# Direções diagonais, na mesma ordem usada pela geração de movimentos original
+UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT = range(4)
+DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+OPPOSITE = (DOWN_RIGHT, DOWN_LEFT, UP_RIGHT, UP_LEFT)
+FORWARD = ((UP_LEFT, UP_RIGHT), (DOWN_LEFT, DOWN_RIGHT))  # Azuis sobem, rosas descem
+PROMOTION_ROW = (TOP_ROW, BOTTOM_ROW)
+
+# Deslocamento em bits de um passo em cada direção: (linhas pares, linhas ímpares)
+_SHIFTS = ((4, 5), (3, 4), (4, 3), (5, 4))
+# Diferença de índice de um passo, conforme a paridade da linha de origem, e de um salto (dois passos)
+STEP = ((-4, -5), (-3, -4), (4, 3), (5, 4))
+JUMP = (-9, -7, 7, 9)
+# Casas a partir das quais é possível dar um passo em cada direção
+_SOURCES = (
+    FULL_BOARD & ~TOP_ROW & ~LEFT_EDGE,
+    FULL_BOARD & ~TOP_ROW & ~RIGHT_EDGE,
+    FULL_BOARD & ~BOTTOM_ROW & ~LEFT_EDGE,
+    FULL_BOARD & ~BOTTOM_ROW & ~RIGHT_EDGE,
+)
+
+SQUARE_TO_RC = tuple((sq // 4, 2 * (sq % 4) + (1 - (sq // 4) % 2)) for sq in range(32))
+ROW_OF = tuple(rc[0] for rc in SQUARE_TO_RC)
+
+
+def square_of(row, col):
+    """Converte (linha, coluna) no índice da casa, ou None se a casa não for jogável."""
+    if not (0 <= row < 8 and 0 <= col < 8) or (row + col) % 2 == 0:
+        return None
+    return row * 4 + col // 2
+
+
+def shift(mask, direction):
+    """Desloca todas as casas de mask um passo na direção dada, descartando o que sai do tabuleiro."""
+    even_amount, odd_amount = _SHIFTS[direction]
+    mask &= _SOURCES[direction]
+    if direction >= DOWN_LEFT:
+        return ((mask & EVEN_ROWS) << even_amount) | ((mask & ODD_ROWS) << odd_amount)
+    return ((mask & EVEN_ROWS) >> even_amount) | ((mask & ODD_ROWS) >> odd_amount)
+
+
+def _ray(sq, direction):
+    """Casas percorridas a partir de sq (sem incluí-la) até a borda, na ordem, na direção dada."""
+    squares = []
+    step = shift(1 << sq, direction)
+    while step:
+        squares.append(step.bit_length() - 1)
+        step = shift(step, direction)
+    return tuple(squares)
+
+
+# Tabelas calculadas uma única vez, na importação:
+# RAYS[casa][direção]: casas ao longo do raio, da mais próxima à mais distante (movimento das damas)
+# NEIGHBOURS[casa][direção]: casa vizinha na direção, ou None na borda (movimento das pedras)
+# JUMPS[casa][direção]: (casa saltada, casa de pouso) de uma captura de pedra, ou None perto da borda
+RAYS = tuple(tuple(_ray(sq, direction) for direction in range(4)) for sq in range(32))
+NEIGHBOURS = tuple(tuple(ray[0] if ray else None for ray in RAYS[sq]) for sq in range(32))
+JUMPS = tuple(tuple((ray[0], ray[1]) if len(ray) > 1 else None for ray in RAYS[sq]) for sq in range(32))
+
+# DIAGONALS[casa]: máscara das duas diagonais que passam pela casa (sem incluí-la)
+# NEIGHBOURHOOD[casa]: máscara das casas a até dois passos em cada diagonal (o alcance de uma pedra)
+DIAGONALS = tuple(sum(1 << other for ray in RAYS[sq] for other in ray) for sq in range(32))
+NEIGHBOURHOOD = tuple(sum(1 << other for ray in RAYS[sq] for other in ray[:2]) for sq in range(32))
+
+
+# Chaves de Zobrist (64 bits) para identificar posições: uma por tipo de peça e casa,
+# com tipo = lado * 2 + (1 se dama), e uma para o lado a jogar. A semente é fixa para
+# que a mesma posição tenha a mesma chave em qualquer processo.
+_zobrist_random = random.Random(0x5EED_DA4A5)
+ZOBRIST = tuple(tuple(_zobrist_random.getrandbits(64) for _ in range(32)) for _ in range(4))
+ZOBRIST_SIDE = _zobrist_random.getrandbits(64)
+del _zobrist_random
+
+
+def iter_squares(mask):
+    """Percorre os índices das casas presentes em mask, em ordem crescente."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def popcount(mask):
+    """Número de casas presentes em mask."""
+    return mask.bit_count()
+
+
+class Position:
+    """
+    Posição do jogo: peças azuis, peças rosas, damas (de ambos os lados) e lado a jogar.
+    piece_hash é a parte da chave de Zobrist referente às peças, atualizada por XOR
+    em move(), unmove() e play(); a chave completa (com o lado a jogar) é key.
+    """
+    __slots__ = ('blue', 'pink', 'kings', 'side', 'piece_hash')
+
+    def __init__(self, blue=0, pink=0, kings=0, side=BLUE):
+        self.blue = blue
+        self.pink = pink
+        self.kings = kings
+        self.side = side
+        self.piece_hash = self.compute_piece_hash()
+
+    @classmethod
+    def initial(cls):
+        """Posição inicial: rosas nas linhas 0-2, azuis nas linhas 5-7, azul começa."""
+        return cls(blue=0xFFF00000, pink=0x00000FFF)
+
+    @classmethod
+    def from_rows(cls, rows, side=BLUE):
+        """Cria uma posição a partir de uma matriz 8x8 de caracteres ('-', 'x', 'X', 'o', 'O')."""
+        position = cls(side=side)
+        for sq, (row, col) in enumerate(SQUARE_TO_RC):
+            piece = rows[row][col]
+            if piece == '-':
+                continue
+            bit = 1 << sq
+            if piece.lower() == 'o':
+                position.blue |= bit
+            else:
+                position.pink |= bit
+            if piece.isupper():
+                position.kings |= bit
+        position.piece_hash = position.compute_piece_hash()
+        return position
+
+    def to_rows(self):
+        """Gera a matriz 8x8 de caracteres equivalente a esta posição."""
+        rows = [['-'] * 8 for _ in range(8)]
+        for sq in iter_squares(self.blue | self.pink):
+            row, col = SQUARE_TO_RC[sq]
+            rows[row][col] = self.piece_at(sq)
+        return rows
+
+    def copy(self):
+        return Position(self.blue, self.pink, self.kings, self.side)
+
+    def compute_piece_hash(self):
+        """Calcula do zero a chave de Zobrist das peças (sem o lado a jogar)."""
+        piece_hash = 0
+        for kind, mask in enumerate((self.blue & ~self.kings, self.blue & self.kings,
+                                     self.pink & ~self.kings, self.pink & self.kings)):
+            keys = ZOBRIST[kind]
+            for sq in iter_squares(mask):
+                piece_hash ^= keys[sq]
+        return piece_hash
+
+    @property
+    def key(self):
+        """Chave de Zobrist de 64 bits da posição: peças e lado a jogar."""
+        return self.piece_hash ^ ZOBRIST_SIDE if self.side else self.piece_hash
+
+    @property
+    def occupied(self):
+        return self.blue | self.pink
+
+    @property
+    def empty(self):
+        return FULL_BOARD & ~(self.blue | self.pink)
+
+    def pieces(self, side):
+        """Todas as peças (pedras e damas) do lado dado."""
+        return self.pink if side else self.blue
+
+    def men(self, side):
+        return (self.pink if side else self.blue) & ~self.kings
+
+    def kings_of(self, side):
+        return (self.pink if side else self.blue) & self.kings
+
+    def piece_at(self, sq):
+        """Caractere da peça na casa sq, no formato da matriz original."""
+        bit = 1 << sq
+        if self.blue & bit:
+            return 'O' if self.kings & bit else 'o'
+        if self.pink & bit:
+            return 'X' if self.kings & bit else 'x'
+        return '-'
+
+    def side_of(self, sq):
+        """Lado dono da peça na casa sq, ou None se a casa estiver vazia."""
+        bit = 1 << sq
+        if self.blue & bit:
+            return BLUE
+        if self.pink & bit:
+            return PINK
+        return None
+
+    def move(self, origin, dest, captured=None):
+        """
+        Move a peça de origin para dest, remove a peça capturada (se houver)
+        e promove a dama ao atingir a última linha. Retorna True se houve promoção.
+        """
+        origin_bit = 1 << origin
+        dest_bit = 1 << dest
+        if self.blue & origin_bit:
+            side = BLUE
+            self.blue ^= origin_bit | dest_bit
+        else:
+            side = PINK
+            self.pink ^= origin_bit | dest_bit
+        kind = side * 2
+        if self.kings & origin_bit:
+            self.kings ^= origin_bit | dest_bit
+            kind += 1
+        piece_hash = self.piece_hash ^ ZOBRIST[kind][origin]
+        if captured is not None:
+            captured_bit = 1 << captured
+            piece_hash ^= ZOBRIST[2 - side * 2 + (self.kings >> captured & 1)][captured]
+            self.blue &= ~captured_bit
+            self.pink &= ~captured_bit
+            self.kings &= ~captured_bit
+        promoted = False
+        if dest_bit & PROMOTION_ROW[side] and not self.kings & dest_bit:
+            self.kings |= dest_bit
+            kind += 1
+            promoted = True
+        self.piece_hash = piece_hash ^ ZOBRIST[kind][dest]
+        return promoted
+
+    def unmove(self, origin, dest, captured=None, captured_king=False, promoted=False):
+        """Desfaz move(origin, dest, captured), recolocando a peça capturada e revertendo a promoção."""
+        origin_bit = 1 << origin
+        dest_bit = 1 << dest
+        if self.blue & dest_bit:
+            self.blue ^= origin_bit | dest_bit
+            captured_side = PINK
+            kind = 0
+        else:
+            self.pink ^= origin_bit | dest_bit
+            captured_side = BLUE
+            kind = 2
+        piece_hash = self.piece_hash
+        if self.kings & dest_bit:
+            piece_hash ^= ZOBRIST[kind + 1][dest]
+            if promoted:
+                self.kings &= ~dest_bit
+            else:
+                self.kings ^= origin_bit | dest_bit
+                kind += 1
+        else:
+            piece_hash ^= ZOBRIST[kind][dest]
+        piece_hash ^= ZOBRIST[kind][origin]
+        if captured is not None:
+            captured_bit = 1 << captured
+            if captured_side == BLUE:
+                self.blue |= captured_bit
+            else:
+                self.pink |= captured_bit
+            if captured_king:
+                self.kings |= captured_bit
+            piece_hash ^= ZOBRIST[captured_side * 2 + bool(captured_king)][captured]
+        self.piece_hash = piece_hash
+
+    def play(self, turn):
+        """
+        Aplica um turno completo (ver movegen.Turn) e passa a vez.
+        Retorna o estado anterior, a ser passado para restore().
+        """
+        previous = (self.blue, self.pink, self.kings, self.side, self.piece_hash)
+        path = turn.path
+        origin, dest = path[0], path[-1]
+        origin_bit = 1 << origin
+        dest_bit = 1 << dest
+        kings = self.kings
+        kind = self.side * 2 + (kings >> origin & 1)
+        piece_hash = self.piece_hash ^ ZOBRIST[kind][origin]
+        captured_mask = 0
+        opponent_kind = 2 - self.side * 2
+        for sq in turn.captured:
+            captured_mask |= 1 << sq
+            piece_hash ^= ZOBRIST[opponent_kind + (kings >> sq & 1)][sq]
+        kings &= ~captured_mask
+        if kings & origin_bit or turn.promotes:
+            kings = (kings & ~origin_bit) | dest_bit
+            kind |= 1
+        self.piece_hash = piece_hash ^ ZOBRIST[kind][dest]
+        if self.side:
+            self.pink = (self.pink & ~origin_bit) | dest_bit
+            self.blue &= ~captured_mask
+        else:
+            self.blue = (self.blue & ~origin_bit) | dest_bit
+            self.pink &= ~captured_mask
+        self.kings = kings
+        self.side ^= 1
+        return previous
+
+    def restore(self, state):
+        """Restaura o estado retornado por play()."""
+        self.blue, self.pink, self.kings, self.side, self.piece_hash = state
@@ -0,0 +1,175 @@
+"""
+Livro de aberturas gerado por autojogo.
+
+O gerador parte da posição inicial e joga partidas pelo próprio livro: em cada
+posição ainda não vista, todos os turnos são avaliados com a busca, e os que
+ficam a até margin pontos do melhor entram no livro com peso proporcional à
+qualidade; o próximo turno da partida é sorteado por esses pesos, de modo que
+as variantes mais jogadas são as melhores.
+
+O arquivo tem um cabeçalho (assinatura, versão, número de registros) seguido
+de registros de tamanho fixo (chave de Zobrist da posição, código do turno,
+peso), ordenados pela chave. Ele é lido com mmap e consultado por busca
+binária, sem nenhuma carga além do cabeçalho.
+
+Geração (a partir da pasta jogo/):
+    python -m damas.book --games 200 --plies 10 --depth 6
+"""
+
+import mmap
+import os
+import random
+import struct
+
+from .bitboard import Position
+from .evaluate import WIN_SCORE, evaluate
+from .movegen import generate_turns
+from .search import SearchResult, Searcher
+from .tt import encode_turn
+
+MAGIC = b'DMOB'
+VERSION = 1
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'book.bin')
+
+_HEADER = struct.Struct('<4sHxxI')  # Assinatura, versão, número de registros
+_RECORD = struct.Struct('<QIHxx')  # Chave da posição, código do turno (encode_turn), peso
+_KEY = struct.Struct('<Q')
+
+
+def _candidates(position, searcher, depth, margin):
+    """Turnos da posição que ficam a até margin pontos do melhor, com seus pesos: [(código, peso), ...]."""
+    turns = list(generate_turns(position))
+    if not turns:
+        return [] # Fim de partida: nada para o livro
+    if len(turns) == 1:
+        return [(encode_turn(turns[0]), 1)]
+    scores = []
+    for turn in turns:
+        previous_state = position.play(turn)
+        replies = list(generate_turns(position))
+        if replies:
+            iterations = searcher.iterate(position, replies, time_limit_ms=60000, max_depth=max(1, depth - 1))
+            # Sem nenhuma iteração completa (busca interrompida), vale a avaliação estática
+            score = -(iterations[-1].score if iterations else evaluate(position))
+        else:
+            score = WIN_SCORE # O oponente fica sem lances
+        position.restore(previous_state)
+        scores.append(score)
+    best = max(scores)
+    return [
+        (encode_turn(turn), max(1, round(100 * (1 - (best - score) / margin))))
+        for turn, score in zip(turns, scores) if best - score <= margin
+    ]
+
+
+def build(games=200, plies=10, depth=6, margin=30, path=DEFAULT_BOOK_PATH, seed=0, progress=None):
+    """
+    Gera o livro com games partidas de plies turnos a partir da posição inicial, avaliando
+    os turnos com busca de profundidade depth, e grava o arquivo em path.
+    """
+    rng = random.Random(seed)
+    searcher = Searcher()
+    entries = {} # {chave da posição: [(código do turno, peso), ...]}
+    for game in range(games):
+        position = Position.initial()
+        for _ in range(plies):
+            key = position.key
+            if key not in entries:
+                entries[key] = _candidates(position, searcher, depth, margin)
+            candidates = entries[key]
+            if not candidates:
+                break
+            code = rng.choices([code for code, _ in candidates], [weight for _, weight in candidates])[0]
+            position.play(next(turn for turn in generate_turns(position) if encode_turn(turn) == code))
+        if progress is not None:
+            progress(game + 1, len(entries))
+
+    records = sorted((key, code, weight) for key, candidates in entries.items() for code, weight in candidates)
+    with open(path, 'wb') as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, len(records)))
+        for record in records:
+            file.write(_RECORD.pack(*record))
+
+
+class OpeningBook:
+    """Consulta a um livro gerado por build(), mapeado em memória."""
+
+    def __init__(self, path=DEFAULT_BOOK_PATH, rng=None):
+        self._file = open(path, 'rb')
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.size = _HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError('%s não é um livro de aberturas do jogo (versão %d)' % (path, VERSION))
+        self._rng = rng or random.Random()
+
+    def _key_at(self, index):
+        return _KEY.unpack_from(self._data, _HEADER.size + index * _RECORD.size)[0]
+
+    def moves(self, key):
+        """Turnos do livro para a posição de chave key: [(código do turno, peso), ...]."""
+        low, high = 0, self.size
+        while low < high: # Primeiro registro com chave >= key
+            middle = (low + high) // 2
+            if self._key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        moves = []
+        for index in range(low, self.size):
+            record_key, code, weight = _RECORD.unpack_from(self._data, _HEADER.size + index * _RECORD.size)
+            if record_key != key:
+                break
+            moves.append((code, weight))
+        return moves
+
+    def choose(self, position):
+        """Sorteia, pelos pesos, um turno do livro para a posição; None se ela não estiver no livro."""
+        moves = self.moves(position.key)
+        if not moves:
+            return None
+        codes = [code for code, _ in moves]
+        code = self._rng.choices(codes, [weight for _, weight in moves])[0]
+        for turn in generate_turns(position):
+            if encode_turn(turn) == code:
+                return turn
+        return None # Colisão de chave: o código não é de um turno desta posição
+
+    def search(self, position, *args, **kwargs):
+        """Resultado no formato de Searcher.search para o turno do livro, ou None."""
+        turn = self.choose(position)
+        return SearchResult(turn, 0, 0, 0) if turn is not None else None
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+
+_default_book = False  # Ainda não procurado
+
+
+def default_book():
+    """Livro do arquivo padrão, aberto uma única vez por processo, ou None se ele não existir."""
+    global _default_book
+    if _default_book is False:
+        _default_book = OpeningBook() if os.path.exists(DEFAULT_BOOK_PATH) else None
+    return _default_book
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Gera o livro de aberturas do Jogo de Damas.')
+    parser.add_argument('--games', type=int, default=200)
+    parser.add_argument('--plies', type=int, default=10, help='turnos de cada partida do livro')
+    parser.add_argument('--depth', type=int, default=6, help='profundidade da avaliação dos turnos')
+    parser.add_argument('--margin', type=int, default=30, help='pontos abaixo do melhor turno aceitos no livro')
+    parser.add_argument('--out', default=DEFAULT_BOOK_PATH)
+    args = parser.parse_args()
+
+    def report(game, positions):
+        if game % 10 == 0:
+            print('%d partidas, %d posições' % (game, positions))
+
+    build(args.games, args.plies, args.depth, args.margin, args.out, progress=report)
+    print('Livro gravado em', args.out)
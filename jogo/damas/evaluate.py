@@ -0,0 +1,37 @@
+"""
+Avaliação estática de posições para a busca.
+
+A pontuação é dada do ponto de vista do lado a jogar (positiva = vantagem dele),
+como espera a busca negamax.
+"""
+
+from .bitboard import BOTTOM_ROW, TOP_ROW
+
+MAN_VALUE = 100
+KING_VALUE = 300  # As damas voam pela diagonal e valem bem mais que as pedras
+ADVANCE_BONUS = 8  # Por pedra nas três linhas mais próximas da promoção
+BACK_ROW_BONUS = 6  # Por pedra ainda na linha de base, defendendo a promoção do oponente
+CENTER_BONUS = 4  # Por peça nas casas centrais (linhas 3 e 4, colunas 2 a 5)
+
+# Linhas 1-3 (avanço das azuis) e linhas 4-6 (avanço das rosas)
+_ADVANCED = (0x0000FFF0, 0x0FFF0000)
+_BACK_ROW = (BOTTOM_ROW, TOP_ROW)
+_CENTER = 0x00066000
+
+# Pontuação máxima em módulo de uma avaliação estática; valores acima indicam vitória
+WIN_SCORE = 100000
+
+
+def evaluate(position):
+    """Avaliação da posição para o lado a jogar: material, avanço, defesa da base e centro."""
+    blue, pink, kings = position.blue, position.pink, position.kings
+    blue_men = blue & ~kings
+    pink_men = pink & ~kings
+    score = (
+        MAN_VALUE * (blue_men.bit_count() - pink_men.bit_count())
+        + KING_VALUE * ((blue & kings).bit_count() - (pink & kings).bit_count())
+        + ADVANCE_BONUS * ((blue_men & _ADVANCED[0]).bit_count() - (pink_men & _ADVANCED[1]).bit_count())
+        + BACK_ROW_BONUS * ((blue_men & _BACK_ROW[0]).bit_count() - (pink_men & _BACK_ROW[1]).bit_count())
+        + CENTER_BONUS * ((blue & _CENTER).bit_count() - (pink & _CENTER).bit_count())
+    )
+    return -score if position.side else score
@@ -0,0 +1,214 @@
+"""
+Benchmark do tempo de decisão da IA, com linha de base para detectar regressões.
+
+Cada posição de um conjunto fixo é montada num GameState (load_position) e a IA
+joga com computer_move, exatamente como na partida, mas sem a interface e sem
+as pausas de AI_DELAY_MS. A busca é limitada por profundidade (com tempo de
+sobra), de modo que o trabalho por posição é fixo e o tempo medido mostra o
+custo da implementação. O livro de aberturas é desligado, pois responderia sem busca.
+
+Para cada posição são registrados a latência (p50, p95 e máximo entre as
+repetições, cada uma com um GameState novo), os nós buscados e o pico de memória
+alocada durante a jogada (tracemalloc, numa execução à parte para não afetar o
+tempo), junto com a complexidade da posição (peças, damas, turnos, maior captura).
+
+Uso (a partir da pasta jogo/):
+    python -m damas.latency --save linha_de_base.json
+    python -m damas.latency --baseline linha_de_base.json --threshold 0.25
+O segundo comando termina com erro se alguma medida piorar mais que threshold.
+"""
+
+import json
+import random
+import time
+import tracemalloc
+
+from .bitboard import PLAYERS, Position
+from .movegen import generate_turns
+from .perft import TEST_POSITIONS
+from .state import GameState
+
+DEFAULT_DEPTH = 6
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.25  # Piora relativa tolerada em relação à linha de base
+_TIME_LIMIT_MS = 10 ** 9  # Sem limite de tempo na prática: a busca para na profundidade
+
+
+def _random_game_position(seed, plies):
+    """Posição após plies turnos sorteados a partir da inicial."""
+    rng = random.Random(seed)
+    position = Position.initial()
+    for _ in range(plies):
+        turns = list(generate_turns(position))
+        if not turns:
+            break
+        position.play(rng.choice(turns))
+    return position
+
+
+def _kings_position(seed, kings_per_side):
+    """Final com kings_per_side damas de cada lado, em casas sorteadas."""
+    rng = random.Random(seed)
+    squares = rng.sample(range(32), 2 * kings_per_side)
+    blue = sum(1 << sq for sq in squares[:kings_per_side])
+    pink = sum(1 << sq for sq in squares[kings_per_side:])
+    return Position(blue=blue, pink=pink, kings=blue | pink, side=seed % 2)
+
+
+def corpus():
+    """Posições do benchmark: [(nome, Position), ...], sempre as mesmas."""
+    positions = [(name, Position.from_rows(rows, side)) for name, rows, side, _ in TEST_POSITIONS]
+    for plies in (8, 20, 35, 50):
+        for seed in range(2):
+            positions.append(('partida_%d_%d' % (plies, seed), _random_game_position(seed, plies)))
+    for kings_per_side in (3, 5):
+        positions.append(('damas_%d' % kings_per_side, _kings_position(kings_per_side, kings_per_side)))
+    return [(name, position) for name, position in positions if any(True for _ in generate_turns(position))]
+
+
+def complexity(position):
+    """Medidas de complexidade da posição: peças, damas, turnos legais e maior número de capturas num turno."""
+    turns = list(generate_turns(position))
+    return {
+        'pieces': (position.blue | position.pink).bit_count(),
+        'kings': position.kings.bit_count(),
+        'turns': len(turns),
+        'longest_capture': max((len(turn.captured) for turn in turns), default=0),
+    }
+
+
+def _percentile(values, fraction):
+    """Percentil por posto mais próximo de values (já ordenados)."""
+    index = max(0, min(len(values) - 1, round(fraction * len(values) + 0.5) - 1))
+    return values[index]
+
+
+def _computer_state(position, depth):
+    """
+    GameState com a posição montada e o computador a jogar, com a busca limitada a depth
+    e o searcher já criado, para que a alocação da tabela não entre no tempo nem na memória.
+    """
+    state = GameState(vs_computer=True)
+    state.book = None
+    state.ai_time_limit_ms = _TIME_LIMIT_MS
+    state.ai_max_depth = depth
+    state.computer_player = PLAYERS[position.side]
+    state.load_position(position)
+    state.searcher # Cria o searcher (e aloca a tabela de transposição) antes das medições
+    return state
+
+
+def measure(position, depth=DEFAULT_DEPTH, repeat=DEFAULT_REPEAT):
+    """Mede computer_move na posição: {'p50_ms', 'p95_ms', 'max_ms', 'nodes', 'peak_kb', ...complexidade}."""
+    latencies = []
+    nodes = 0
+    for _ in range(repeat):
+        state = _computer_state(position, depth)
+        start = time.perf_counter()
+        state.computer_move()
+        latencies.append((time.perf_counter() - start) * 1000)
+        nodes = state.last_search.nodes
+
+    state = _computer_state(position, depth)
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline_memory = tracemalloc.get_traced_memory()[0]
+        state.computer_move()
+        peak = tracemalloc.get_traced_memory()[1] - baseline_memory
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    result = {
+        'p50_ms': round(_percentile(latencies, 0.5), 3),
+        'p95_ms': round(_percentile(latencies, 0.95), 3),
+        'max_ms': round(latencies[-1], 3),
+        'nodes': nodes,
+        'peak_kb': round(peak / 1024, 1),
+    }
+    result.update(complexity(position))
+    return result
+
+
+def run(depth=DEFAULT_DEPTH, repeat=DEFAULT_REPEAT, report=None):
+    """Mede todas as posições do corpus. Retorna a linha de base: {'settings': {...}, 'positions': {nome: medidas}}."""
+    results = {}
+    for name, position in corpus():
+        results[name] = measure(position, depth, repeat)
+        if report is not None:
+            report(name, results[name])
+    return {'settings': {'depth': depth, 'repeat': repeat}, 'positions': results}
+
+
+# Medidas comparadas com a linha de base (todas são melhores quanto menores)
+_COMPARED = ('p50_ms', 'p95_ms', 'nodes', 'peak_kb')
+# Diferenças absolutas abaixo destas não contam como regressão (ruído de medida em posições rápidas)
+_MIN_DIFFERENCE = {'p50_ms': 5.0, 'p95_ms': 5.0, 'nodes': 0, 'peak_kb': 16.0}
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Regressões de current em relação a baseline: [(posição, medida, antes, agora), ...] para
+    as medidas que pioraram mais que a fração threshold. Posições ausentes de um dos lados são ignoradas.
+    """
+    regressions = []
+    for name, measures in current['positions'].items():
+        before = baseline['positions'].get(name)
+        if before is None:
+            continue
+        for measure_name in _COMPARED:
+            old, new = before[measure_name], measures[measure_name]
+            if new > old * (1 + threshold) and new - old > _MIN_DIFFERENCE[measure_name]:
+                regressions.append((name, measure_name, old, new))
+    return regressions
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='Mede o tempo de decisão da IA num conjunto fixo de posições.')
+    parser.add_argument('--depth', type=int, help='profundidade da busca (padrão: a da linha de base, ou %d)'
+                        % DEFAULT_DEPTH)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='repetições por posição')
+    parser.add_argument('--save', help='grava as medidas como linha de base neste arquivo JSON')
+    parser.add_argument('--baseline', help='compara as medidas com a linha de base deste arquivo JSON')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='piora relativa tolerada')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    depth = args.depth or (baseline['settings']['depth'] if baseline else DEFAULT_DEPTH)
+
+    print('%-20s %9s %9s %9s %9s %9s  %s' % ('posição', 'p50 ms', 'p95 ms', 'máx ms', 'nós', 'pico KB',
+                                             'peças/damas/turnos/captura'))
+
+    def report(name, measures):
+        print('%-20s %9.1f %9.1f %9.1f %9d %9.1f  %d/%d/%d/%d' % (
+            name, measures['p50_ms'], measures['p95_ms'], measures['max_ms'], measures['nodes'],
+            measures['peak_kb'], measures['pieces'], measures['kings'], measures['turns'],
+            measures['longest_capture']))
+
+    current = run(depth, args.repeat, report)
+    latencies = sorted(measures['p50_ms'] for measures in current['positions'].values())
+    print('Corpus: p50 %.1f ms, p95 %.1f ms, máx %.1f ms' % (
+        _percentile(latencies, 0.5), _percentile(latencies, 0.95), latencies[-1]))
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump(current, file, indent=2, sort_keys=True)
+        print('Linha de base gravada em', args.save)
+
+    if baseline is not None:
+        if baseline['settings']['depth'] != depth:
+            print('Aviso: a linha de base foi medida com profundidade %d' % baseline['settings']['depth'])
+        regressions = compare(current, baseline, args.threshold)
+        for name, measure_name, old, new in regressions:
+            print('REGRESSÃO %s %s: %s -> %s (%+.0f%%)' % (name, measure_name, old, new, 100 * (new / old - 1)
+                                                         if old else float('inf')))
+        if regressions:
+            sys.exit(1)
+        print('Nenhuma regressão acima de %.0f%%' % (100 * args.threshold))
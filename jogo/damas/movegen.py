@@ -0,0 +1,268 @@
+"""
+Geração de movimentos sobre bitboards.
+
+As pedras usam deslocamentos e máscaras para descobrir, de uma só vez, quais
+peças podem mover ou capturar; as damas (que voam pela diagonal) percorrem
+cada raio passo a passo. A ordem dos movimentos gerados é a mesma da
+implementação original sobre a matriz 8x8.
+"""
+
+from collections import namedtuple
+
+from .bitboard import (
+    EVEN_ROWS, FORWARD, JUMP, JUMPS, NEIGHBOURS, ODD_ROWS, OPPOSITE, PLAYERS, PROMOTION_ROW, RAYS, STEP,
+    _SHIFTS, _SOURCES, iter_squares, shift,
+)
+
+# Um turno completo: casas percorridas (origem, pousos...), peças capturadas em ordem
+# (o salto i captura captured[i]) e se a pedra foi promovida a dama durante o turno.
+Turn = namedtuple('Turn', 'path captured promotes')
+
+
+def _back(mask, direction):
+    """Casas que alcançam mask com um passo na direção dada."""
+    return shift(mask, OPPOSITE[direction])
+
+
+def capturing_men(position, side):
+    """Máscara das pedras do lado dado que têm alguma captura disponível."""
+    men = position.men(side)
+    opponent = position.pieces(1 - side)
+    empty = position.empty
+    result = 0
+    for direction in FORWARD[side]:
+        result |= men & _back(opponent & _back(empty, direction), direction)
+    return result
+
+
+def moving_men(position, side):
+    """Máscara das pedras do lado dado que têm algum movimento simples disponível."""
+    men = position.men(side)
+    empty = position.empty
+    result = 0
+    for direction in FORWARD[side]:
+        result |= men & _back(empty, direction)
+    return result
+
+
+def moving_kings(position, side):
+    """Máscara das damas do lado dado com alguma casa vizinha livre."""
+    kings = position.kings_of(side)
+    empty = position.empty
+    result = 0
+    for direction in range(4):
+        result |= kings & _back(empty, direction)
+    return result
+
+
+def attacked_pieces(position, attacker):
+    """
+    Mapa de ataque: máscara das peças do oponente de attacker que ele poderia capturar
+    num salto a partir desta posição. Pedras são tratadas em bloco com deslocamentos;
+    cada dama percorre seus quatro raios uma única vez.
+    popcount() do resultado dá quantas peças estão ameaçadas.
+    """
+    if attacker:
+        own, defender = position.pink, position.blue
+    else:
+        own, defender = position.blue, position.pink
+    occupied = own | defender
+    empty = ~occupied & 0xFFFFFFFF
+    attacked = 0
+    men = own & ~position.kings
+    for direction in FORWARD[attacker]:
+        attacked |= shift(men, direction) & defender & _back(empty, direction)
+    kings = own & position.kings
+    while kings:
+        low = kings & -kings
+        kings ^= low
+        for ray in RAYS[low.bit_length() - 1]:
+            for index, current in enumerate(ray):
+                if occupied >> current & 1:
+                    # Primeira peça do raio: ameaçada se for do oponente e a casa seguinte estiver livre
+                    if defender >> current & 1 and index + 1 < len(ray) and not occupied >> ray[index + 1] & 1:
+                        attacked |= 1 << current
+                    break
+    return attacked
+
+
+def capture_moves(position, sq, side):
+    """
+    Capturas disponíveis para a peça na casa sq, jogando pelo lado dado.
+    Retorna uma lista de tuplas (casa_destino, casa_capturada).
+    """
+    if side:
+        opponent = position.blue
+    else:
+        opponent = position.pink
+    occupied = position.blue | position.pink
+    captures = []
+    if not position.kings >> sq & 1:  # Pedra: captura apenas para frente
+        jumps = JUMPS[sq]
+        for direction in FORWARD[side]:
+            jump = jumps[direction]
+            if jump is not None and opponent >> jump[0] & 1 and not occupied >> jump[1] & 1:
+                captures.append((jump[1], jump[0]))
+    else:  # Dama: percorre o raio até a primeira peça e pousa em qualquer casa livre depois dela
+        for ray in RAYS[sq]:
+            captured = None
+            for current in ray:
+                if occupied >> current & 1:
+                    if captured is not None or not opponent >> current & 1:
+                        break  # Segunda peça no raio, ou peça própria
+                    captured = current
+                elif captured is not None:
+                    captures.append((current, captured))
+    return captures
+
+
+def normal_moves(position, sq, side):
+    """Movimentos simples (sem captura) da peça na casa sq. Retorna a lista de casas de destino."""
+    occupied = position.blue | position.pink
+    moves = []
+    if not position.kings >> sq & 1:
+        neighbours = NEIGHBOURS[sq]
+        for direction in FORWARD[side]:
+            dest = neighbours[direction]
+            if dest is not None and not occupied >> dest & 1:
+                moves.append(dest)
+    else:
+        for ray in RAYS[sq]:
+            for current in ray:
+                if occupied >> current & 1:
+                    break
+                moves.append(current)
+    return moves
+
+
+def legal_moves(position, side=None):
+    """
+    Movimentos permitidos para o lado dado (por padrão, o lado a jogar).
+    Se houver capturas, apenas elas são permitidas.
+    Retorna {casa_origem: [(casa_destino, casa_capturada ou None), ...]}.
+    """
+    if side is None:
+        side = position.side
+    moves = {}
+    candidates = capturing_men(position, side) | position.kings_of(side)
+    for sq in iter_squares(candidates):
+        captures = capture_moves(position, sq, side)
+        if captures:
+            moves[sq] = captures
+    if moves:
+        return moves
+    for sq in iter_squares(moving_men(position, side) | moving_kings(position, side)):
+        moves[sq] = [(dest, None) for dest in normal_moves(position, sq, side)]
+    return moves
+
+
+# Parâmetros dos passos para frente das pedras de cada lado:
+# (deslocamento nas linhas pares, nas linhas ímpares, casas de origem válidas, diferença do salto, diferenças do passo)
+_MEN_STEPS = tuple(
+    tuple((_SHIFTS[d][0], _SHIFTS[d][1], _SOURCES[d], JUMP[d], STEP[d]) for d in FORWARD[side])
+    for side in range(2)
+)
+
+
+def generate_moves(position):
+    """
+    Lista plana de todos os lances (casa_origem, casa_destino, casa_capturada ou None)
+    do lado a jogar, respeitando a captura obrigatória. Os alvos das pedras são
+    calculados em bloco com deslocamentos; é a função usada em simulações.
+    """
+    side = position.side
+    if side:
+        own, opponent = position.pink, position.blue
+    else:
+        own, opponent = position.blue, position.pink
+    empty = ~(own | opponent) & 0xFFFFFFFF
+    men = own & ~position.kings
+    kings = own & position.kings
+    moves = []
+    for even_amount, odd_amount, valid, jump, step in _MEN_STEPS[side]:
+        m = men & valid
+        if side:  # Rosas descem: deslocamento para a esquerda
+            over = (((m & EVEN_ROWS) << even_amount) | ((m & ODD_ROWS) << odd_amount)) & opponent & valid
+            targets = (((over & EVEN_ROWS) << even_amount) | ((over & ODD_ROWS) << odd_amount)) & empty
+        else:  # Azuis sobem: deslocamento para a direita
+            over = (((m & EVEN_ROWS) >> even_amount) | ((m & ODD_ROWS) >> odd_amount)) & opponent & valid
+            targets = (((over & EVEN_ROWS) >> even_amount) | ((over & ODD_ROWS) >> odd_amount)) & empty
+        while targets:
+            low = targets & -targets
+            targets ^= low
+            dest = low.bit_length() - 1
+            origin = dest - jump
+            moves.append((origin, dest, origin + step[(origin >> 2) & 1]))
+    while kings:
+        low = kings & -kings
+        kings ^= low
+        origin = low.bit_length() - 1
+        for dest, captured in capture_moves(position, origin, side):
+            moves.append((origin, dest, captured))
+    if moves:
+        return moves
+    for even_amount, odd_amount, valid, jump, step in _MEN_STEPS[side]:
+        m = men & valid
+        if side:
+            targets = (((m & EVEN_ROWS) << even_amount) | ((m & ODD_ROWS) << odd_amount)) & empty
+        else:
+            targets = (((m & EVEN_ROWS) >> even_amount) | ((m & ODD_ROWS) >> odd_amount)) & empty
+        while targets:
+            low = targets & -targets
+            targets ^= low
+            dest = low.bit_length() - 1
+            moves.append((dest - step[1 - ((dest >> 2) & 1)], dest, None))
+    kings = own & position.kings
+    while kings:
+        low = kings & -kings
+        kings ^= low
+        origin = low.bit_length() - 1
+        for dest in normal_moves(position, origin, side):
+            moves.append((origin, dest, None))
+    return moves
+
+
+def generate_turns(position):
+    """
+    Gera cada turno legal do lado a jogar como um único Turn. Capturas múltiplas
+    aparecem como uma sequência completa, seguindo as mesmas regras de make_move:
+    a peça capturada sai na hora, a pedra promovida continua saltando como dama e
+    o turno só termina quando a peça não tem mais capturas.
+    """
+    hops = generate_moves(position)
+    if not hops:
+        return
+    side = position.side
+    if hops[0][2] is None:
+        promotion_row = PROMOTION_ROW[side]
+        kings = position.kings
+        for origin, dest, _ in hops:
+            yield Turn((origin, dest), (), not kings >> origin & 1 and bool(promotion_row >> dest & 1))
+        return
+    turns = []
+    for origin, dest, captured in hops:
+        _extend_chain(position, side, [origin], [], False, dest, captured, turns)
+    yield from turns
+
+
+def _extend_chain(position, side, path, captured_list, promoted, dest, captured, turns):
+    """Aplica o salto path[-1] -> dest e continua a sequência enquanto houver capturas; desfaz ao final."""
+    captured_king = bool(position.kings >> captured & 1)
+    hop_promoted = position.move(path[-1], dest, captured)
+    path.append(dest)
+    captured_list.append(captured)
+    follow_ups = capture_moves(position, dest, side)
+    if follow_ups:
+        for next_dest, next_captured in follow_ups:
+            _extend_chain(position, side, path, captured_list, promoted or hop_promoted,
+                          next_dest, next_captured, turns)
+    else:
+        turns.append(Turn(tuple(path), tuple(captured_list), promoted or hop_promoted))
+    captured_list.pop()
+    path.pop()
+    position.unmove(path[-1], dest, captured, captured_king, hop_promoted)
+
+
+def side_index(player_char):
+    """Converte o caractere do jogador ('o' ou 'x') no índice do lado."""
+    return PLAYERS.index(player_char)
@@ -0,0 +1,86 @@
+"""
+Ordenação dos turnos para a busca alfa-beta.
+
+Quanto antes o melhor turno é examinado, mais cortes a busca faz. A ordem é:
+o turno guardado na tabela de transposição, as capturas pelo material ganho,
+os turnos "assassinos" (killers) que causaram corte na mesma profundidade da
+árvore e, por fim, os demais turnos pela tabela de histórico (origem, destino).
+"""
+
+from array import array
+
+from .evaluate import KING_VALUE, MAN_VALUE
+from .tt import encode_turn
+
+MAX_PLY = 128
+KILLER_SLOTS = 2
+
+_TT_MOVE_SCORE = 1 << 30
+_CAPTURE_SCORE = 1 << 24
+_KILLER_SCORE = (1 << 23, 1 << 22)  # Primeiro e segundo killer
+_PROMOTION_SCORE = 1 << 21
+_HISTORY_LIMIT = 1 << 20  # Acima disso o histórico é reduzido à metade
+
+
+class MoveOrderer:
+    """Mantém killers por profundidade (ply) e o histórico de cortes por (origem, destino)."""
+
+    def __init__(self):
+        self.killers = [[0] * KILLER_SLOTS for _ in range(MAX_PLY)]
+        self.history = array('l', bytes(array('l').itemsize * 32 * 32))
+
+    def order(self, position, turns, tt_move=0, ply=0):
+        """Retorna os turnos ordenados do mais para o menos promissor."""
+        if len(turns) < 2:
+            return turns
+        kings = position.kings
+        killers = self.killers[ply] if ply < MAX_PLY else ()
+        history = self.history
+        scored = []
+        for index, turn in enumerate(turns):
+            code = encode_turn(turn)
+            path = turn.path
+            if code == tt_move:
+                score = _TT_MOVE_SCORE
+            elif turn.captured:
+                captured_kings = sum(kings >> sq & 1 for sq in turn.captured)
+                score = (_CAPTURE_SCORE + MAN_VALUE * len(turn.captured)
+                         + (KING_VALUE - MAN_VALUE) * captured_kings)
+                if turn.promotes:
+                    score += KING_VALUE - MAN_VALUE
+            elif code in killers:
+                score = _KILLER_SCORE[killers.index(code)]
+            elif turn.promotes:
+                score = _PROMOTION_SCORE
+            else:
+                score = history[path[0] << 5 | path[-1]]
+            scored.append((-score, index, turn))  # index desempata mantendo a ordem de geração
+        scored.sort()
+        return [turn for _, _, turn in scored]
+
+    def record_cutoff(self, turn, depth, ply):
+        """Registra um turno sem captura que causou corte beta: vira killer e ganha histórico."""
+        if turn.captured:
+            return
+        code = encode_turn(turn)
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != code:
+                killers[1] = killers[0]
+                killers[0] = code
+        index = turn.path[0] << 5 | turn.path[-1]
+        self.history[index] += depth * depth
+        if self.history[index] >= _HISTORY_LIMIT:
+            self.age()
+
+    def age(self):
+        """Reduz o histórico à metade, para que cortes recentes pesem mais."""
+        history = self.history
+        for index in range(len(history)):
+            history[index] >>= 1
+
+    def new_search(self):
+        """Prepara uma nova busca: killers são descartados e o histórico envelhece."""
+        for killers in self.killers:
+            killers[0] = killers[1] = 0
+        self.age()
@@ -0,0 +1,237 @@
+"""
+Busca paralela na raiz com um conjunto de processos.
+
+Os turnos da raiz são divididos entre os processos de trabalho, cada um com o
+seu próprio Searcher (e tabela de transposição), criado uma única vez quando o
+processo inicia. Cada processo recebe a posição em forma compacta (quatro
+inteiros) e os índices dos seus turnos na ordem de generate_turns, e devolve o
+resultado de cada profundidade completada; os resultados são juntados na maior
+profundidade alcançada por todos.
+
+Os processos são criados com "fork" sempre que o sistema o oferece, independentemente
+do padrão do multiprocessing (que passa a ser "forkserver" no Linux a partir do Python
+3.14): com "spawn" ou "forkserver", cada processo reimportaria o módulo principal do
+jogo, que abre a janela. Os processos só precisam deste módulo (a inicialização e as
+buscas são funções daqui), e GameState os inicia ao ser criado, na thread principal,
+antes de existirem as threads da busca em segundo plano e do pondering. Sem "fork"
+(Windows), é usado "spawn", e o módulo principal precisa poder ser importado sem efeitos.
+
+Para comparar com a busca de um só processo (a partir da pasta jogo/):
+    python -m damas.parallel --workers 4 --time 1000
+"""
+
+import atexit
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .bitboard import Position
+from .evaluate import WIN_SCORE
+from .movegen import generate_turns
+from .search import DEFAULT_TIME_LIMIT_MS, MATE_THRESHOLD, MAX_DEPTH, SearchResult, Searcher
+from .tablebase import default_tablebase
+from .tt import DEFAULT_TT_MB
+
+_worker_searcher = None  # Searcher do processo de trabalho, criado por _init_worker
+_shared_searchers = {}  # ParallelSearcher de cada número de processos, compartilhados na sessão
+# Contexto dos processos de trabalho (ver o início do arquivo)
+_START_METHOD = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+_CANCEL_POLL_S = 0.005  # Intervalo em que search() confere o seu cancel enquanto os processos buscam
+
+
+def encode_position(position):
+    """Forma compacta da posição para enviar aos processos: (azuis, rosas, damas, lado)."""
+    return (position.blue, position.pink, position.kings, position.side)
+
+
+def decode_position(encoded):
+    return Position(*encoded)
+
+
+def _init_worker(tt_mb, cancel_event):
+    global _worker_searcher
+    _worker_searcher = Searcher(tt_mb, tablebase=default_tablebase())
+    _worker_searcher.cancel_event = cancel_event # Ligado por ParallelSearcher.stop()
+
+
+def _ping():
+    return os.getpid()
+
+
+def _search_subset(encoded, turn_indices, time_limit_ms, max_depth):
+    """
+    Executado no processo de trabalho: busca os turnos de índices turn_indices.
+    Retorna ([(profundidade, índice_do_turno, pontuação), ...], nós).
+    """
+    position = decode_position(encoded)
+    turns = list(generate_turns(position))
+    subset = [turns[index] for index in turn_indices]
+    iterations = _worker_searcher.iterate(position, subset, time_limit_ms, max_depth, store_root=False)
+    return (
+        [(result.depth, turns.index(result.turn), result.score) for result in iterations],
+        _worker_searcher.nodes,
+    )
+
+
+def merge_results(results):
+    """
+    Junta os resultados dos processos, [(iterações, nós), ...], num único SearchResult
+    cujo turno é dado como índice. Compara as pontuações na maior profundidade completada
+    por todos os processos; um processo que encontrou vitória ou derrota forçada antes
+    disso vale com o resultado da sua última iteração.
+    """
+    nodes = sum(worker_nodes for _, worker_nodes in results)
+    common_depth = MAX_DEPTH
+    for iterations, _ in results:
+        if not iterations:
+            return None
+        depth, _, score = iterations[-1]
+        if abs(score) <= MATE_THRESHOLD:
+            common_depth = min(common_depth, depth)
+    best = None
+    for iterations, _ in results:
+        depth, index, score = iterations[min(common_depth, len(iterations)) - 1]
+        if best is None or score > best.score:
+            best = SearchResult(index, score, min(depth, common_depth), nodes)
+    return best
+
+
+class ParallelSearcher:
+    """
+    Busca dividida entre workers processos. Os processos são iniciados uma vez
+    (em start() ou na primeira busca) e reaproveitados até close().
+    Tem a mesma interface de busca de Searcher.
+    """
+
+    def __init__(self, workers=None, tt_mb=DEFAULT_TT_MB):
+        self.workers = workers or os.cpu_count() or 1
+        self.tt_mb = tt_mb
+        self.nodes = 0
+        self._executor = None
+        self._cancel = None # Evento compartilhado com os processos, para interromper a busca
+
+    def start(self):
+        """Inicia os processos de trabalho, se ainda não estiverem rodando."""
+        if self._executor is None:
+            context = multiprocessing.get_context(_START_METHOD)
+            self._cancel = context.Event()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=context, initializer=_init_worker,
+                initargs=(self.tt_mb, self._cancel)
+            )
+            # Força a criação de todos os processos agora, e não no meio da primeira jogada
+            for future in [self._executor.submit(_ping) for _ in range(self.workers)]:
+                future.result()
+        return self
+
+    def close(self):
+        """Encerra os processos de trabalho."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def stop(self):
+        """
+        Interrompe a busca em andamento (chamado de outra thread): os processos consultam o
+        evento junto com o relógio e devolvem as iterações completas. A próxima busca o desliga.
+        """
+        if self._cancel is not None:
+            self._cancel.set()
+
+    def search(self, position, time_limit_ms=DEFAULT_TIME_LIMIT_MS, max_depth=MAX_DEPTH, turns=None, cancel=None):
+        """
+        Como Searcher.search, com os turnos da raiz repartidos entre os processos. O cancel
+        (threading.Event) é consultado aqui a cada _CANCEL_POLL_S segundos e repassado aos
+        processos pelo evento compartilhado, que esta busca desliga ao começar.
+        """
+        all_turns = list(generate_turns(position))
+        root_turns = all_turns if turns is None else list(turns)
+        self.nodes = 0
+        if not root_turns:
+            return SearchResult(None, -WIN_SCORE, 0, 0)
+        if len(root_turns) == 1:
+            return SearchResult(root_turns[0], 0, 0, 0) # Turno forçado: não há o que buscar
+
+        self.start()
+        self._cancel.clear()
+        indices = [all_turns.index(turn) for turn in root_turns]
+        encoded = encode_position(position)
+        futures = [
+            self._executor.submit(_search_subset, encoded, indices[worker::self.workers], time_limit_ms, max_depth)
+            for worker in range(min(self.workers, len(indices)))
+        ]
+        pending = futures
+        while cancel is not None and pending:
+            if cancel.is_set():
+                self._cancel.set()
+                break
+            _, pending = wait(pending, timeout=_CANCEL_POLL_S, return_when=FIRST_COMPLETED)
+        merged = merge_results([future.result() for future in futures])
+        if merged is None:
+            return SearchResult(root_turns[0], 0, 0, 0)
+        self.nodes = merged.nodes
+        return merged._replace(turn=all_turns[merged.turn])
+
+
+def shared_searcher(workers):
+    """
+    ParallelSearcher com workers processos compartilhado por todas as partidas da sessão,
+    para que os processos sejam iniciados uma única vez. É encerrado ao sair do programa.
+    """
+    searcher = _shared_searchers.get(workers)
+    if searcher is None:
+        searcher = _shared_searchers[workers] = ParallelSearcher(workers)
+    return searcher
+
+
+@atexit.register
+def _close_shared_searchers():
+    for searcher in _shared_searchers.values():
+        searcher.close()
+
+
+def _benchmark(workers, time_limit_ms, positions):
+    """Compara profundidade e nós por segundo da busca com 1 e com workers processos."""
+    import random
+    import time
+
+    rng = random.Random(0)
+    samples = []
+    while len(samples) < positions:
+        position = Position.initial()
+        for _ in range(rng.randint(4, 30)):
+            turns = list(generate_turns(position))
+            if not turns:
+                break
+            position.play(rng.choice(turns))
+        if len(list(generate_turns(position))) > 1:
+            samples.append(position)
+
+    serial = Searcher()
+    with ParallelSearcher(workers) as parallel:
+        for name, searcher in (('1 processo', serial), ('%d processos' % workers, parallel)):
+            depth = nodes = 0
+            start = time.perf_counter()
+            for position in samples:
+                result = searcher.search(position, time_limit_ms)
+                depth += result.depth
+                nodes += result.nodes
+            elapsed = time.perf_counter() - start
+            print('%-12s profundidade média %.2f  nós/s %.0f' % (name, depth / len(samples), nodes / elapsed))
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compara a busca paralela com a de um só processo.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--time', type=int, default=DEFAULT_TIME_LIMIT_MS, help='tempo por jogada (ms)')
+    parser.add_argument('--positions', type=int, default=10)
+    args = parser.parse_args()
+    _benchmark(args.workers, args.time, args.positions)
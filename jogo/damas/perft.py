@@ -0,0 +1,152 @@
+"""
+Perft: contagem das folhas da árvore de jogo até uma profundidade.
+
+Cada nível da árvore é um turno completo, como na partida: uma sequência de
+capturas conta como um único lance, e sequências diferentes (mesmo as que levam
+à mesma posição) contam separadamente, assim como a pedra promovida no meio de
+uma sequência continua capturando como dama. Os números de referência abaixo
+foram calculados com as regras originais (make_move e _get_capture_moves sobre a
+matriz 8x8), de modo que qualquer diferença indica uma regra quebrada na geração
+de movimentos.
+
+Para conferir as contagens e medir a velocidade (a partir da pasta jogo/):
+    python -m damas.perft --depth 6
+    python -m damas.perft --position inicial --depth 8 --divide
+"""
+
+import time
+
+from .bitboard import BLUE, PINK, Position
+from .movegen import generate_turns
+
+# (nome, linhas do tabuleiro, lado a jogar, contagens de referência para as profundidades 1, 2, ...)
+TEST_POSITIONS = (
+    ('inicial', (
+        '-x-x-x-x',
+        'x-x-x-x-',
+        '-x-x-x-x',
+        '--------',
+        '--------',
+        'o-o-o-o-',
+        '-o-o-o-o',
+        'o-o-o-o-',
+    ), BLUE, (7, 49, 302, 1469, 7361, 36768, 179740, 846019)),
+    ('meio_de_jogo', (
+        '-x-x-x-x',
+        '--x---x-',
+        '-----x--',
+        '--o---x-',
+        '-----x-o',
+        '--o-----',
+        '-o-----o',
+        'o-o-o-o-',
+    ), BLUE, (10, 66, 362, 2162, 11318, 61638)),
+    ('capturas_multiplas', (
+        '-X-O-O-O',
+        '----X---',
+        '--------',
+        '------o-',
+        '-o-O---o',
+        '--O-----',
+        '---X-O--',
+        '----o-X-',
+    ), PINK, (6, 48, 351, 5796, 40222)),
+    ('promocao_no_salto', (
+        '--------',
+        '--------',
+        '--------',
+        '--------',
+        '-----o--',
+        '--x---o-',
+        '---o---x',
+        'o-------',
+    ), PINK, (1, 3, 19, 54, 379, 1148, 8642)),
+    ('damas_voadoras', (
+        '--------',
+        '--X-O---',
+        '--------',
+        '----o-O-',
+        '-X---x--',
+        '--------',
+        '-------x',
+        '--O---O-',
+    ), BLUE, (3, 10, 67, 198, 2521, 15391)),
+)
+
+
+def perft(position, depth):
+    """Número de sequências de depth turnos a partir da posição."""
+    if depth == 0:
+        return 1
+    if depth == 1:
+        return sum(1 for _ in generate_turns(position))
+    nodes = 0
+    for turn in list(generate_turns(position)):
+        previous_state = position.play(turn)
+        nodes += perft(position, depth - 1)
+        position.restore(previous_state)
+    return nodes
+
+
+def divide(position, depth):
+    """perft separado por turno da raiz: {caminho do turno: folhas}."""
+    counts = {}
+    for turn in list(generate_turns(position)):
+        previous_state = position.play(turn)
+        counts[turn.path] = counts.get(turn.path, 0) + perft(position, depth - 1)
+        position.restore(previous_state)
+    return counts
+
+
+def run_suite(max_depth=None, names=None, report=None):
+    """
+    Confere perft de cada posição de teste (ou só das de nomes names) com as contagens de
+    referência, até max_depth (por padrão, todas as profundidades guardadas).
+    report(nome, profundidade, folhas, esperado, segundos) é chamado a cada contagem.
+    Retorna a lista de divergências: [(nome, profundidade, folhas, esperado), ...].
+    """
+    mismatches = []
+    for name, rows, side, expected_counts in TEST_POSITIONS:
+        if names and name not in names:
+            continue
+        position = Position.from_rows(rows, side)
+        for depth, expected in enumerate(expected_counts[:max_depth], 1):
+            start = time.perf_counter()
+            nodes = perft(position, depth)
+            elapsed = time.perf_counter() - start
+            if report is not None:
+                report(name, depth, nodes, expected, elapsed)
+            if nodes != expected:
+                mismatches.append((name, depth, nodes, expected))
+    return mismatches
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='Confere e mede a geração de movimentos com perft.')
+    parser.add_argument('--depth', type=int, help='profundidade máxima (padrão: todas as guardadas)')
+    parser.add_argument('--position', action='append', help='nome da posição de teste (pode repetir)')
+    parser.add_argument('--divide', action='store_true', help='mostra as folhas por turno da raiz na profundidade máxima')
+    args = parser.parse_args()
+
+    if args.divide:
+        for name, rows, side, expected_counts in TEST_POSITIONS:
+            if args.position and name not in args.position:
+                continue
+            depth = args.depth or len(expected_counts)
+            print('%s, profundidade %d:' % (name, depth))
+            for path, nodes in divide(Position.from_rows(rows, side), depth).items():
+                print('  %-20s %d' % ('-'.join(map(str, path)), nodes))
+        sys.exit(0)
+
+    def report(name, depth, nodes, expected, elapsed):
+        status = 'ok' if nodes == expected else 'ERRO (esperado %d)' % expected
+        print('%-20s %2d %10d  %9.0f folhas/s  %s' % (name, depth, nodes, nodes / max(elapsed, 1e-9), status))
+
+    mismatches = run_suite(args.depth, args.position, report)
+    if mismatches:
+        print('%d contagens divergentes' % len(mismatches))
+        sys.exit(1)
+    print('Todas as contagens conferem')
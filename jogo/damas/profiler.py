@@ -0,0 +1,112 @@
+"""
+Medição do tempo de cada fase dos quadros do laço do jogo.
+
+O laço marca o fim de cada fase (eventos, IA, desenho, espera do relógio) com
+mark(); o tempo de cada fase (somado, se ela aparecer mais de uma vez no quadro)
+e do quadro inteiro é medido com perf_counter_ns e guardado numa janela dos
+últimos quadros, de onde saem os percentis e o histograma do resumo.
+instrument() mede também métodos específicos (por exemplo make_move e
+update_mandatory_moves, as regras executadas nas fases de eventos e da IA),
+somando as chamadas de cada quadro, para saber qual deles pesa numa fase lenta.
+O quadro deve ser encerrado antes de telas que esperam o jogador (como a do
+vencedor), para que a espera não seja contada como um quadro lento.
+
+O perfilador é opcional: com ele desligado, o laço guarda None e cada ponto de
+medição custa apenas um teste "if profiler is not None".
+"""
+
+import sys
+from collections import deque
+from time import perf_counter_ns
+
+DEFAULT_WINDOW = 3600  # Quadros guardados: um minuto a 60 quadros por segundo
+# Limites das faixas do histograma, em ms (16.7 ms é um quadro a 60 FPS)
+HISTOGRAM_EDGES_MS = (1, 2, 4, 8, 16.7, 33.3, 100)
+
+
+class FrameProfiler:
+    """Tempos por fase dos quadros mais recentes do laço do jogo."""
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self.frames = 0
+        self._samples = {} # {nome da fase: deque de durações em ns}, na ordem em que apareceram
+        self._max = {} # {nome da fase: maior duração desde o início, em ns}
+        self._frame = {} # {nome da fase ou do método: ns gastos no quadro atual}
+        self._methods = [] # Nomes dos métodos medidos por instrument()
+        self._frame_start = self._last = perf_counter_ns()
+
+    def start_frame(self):
+        self._frame_start = self._last = perf_counter_ns()
+
+    def mark(self, phase):
+        """Encerra a fase phase do quadro atual (o tempo desde a marca anterior)."""
+        now = perf_counter_ns()
+        self._frame[phase] = self._frame.get(phase, 0) + now - self._last
+        self._last = now
+
+    def end_frame(self):
+        """Registra a duração total do quadro, de cada fase e dos métodos medidos nele."""
+        self._record('quadro', perf_counter_ns() - self._frame_start)
+        frame = self._frame
+        for name, elapsed in frame.items():
+            self._record(name, elapsed)
+        self._frame = dict.fromkeys(self._methods, 0) # Métodos não chamados no quadro contam como 0
+        self.frames += 1
+
+    def instrument(self, obj, *method_names):
+        """Passa a medir as chamadas dos métodos dados de obj (apenas neste objeto)."""
+        for method_name in method_names:
+            name = '%s.%s' % (type(obj).__name__, method_name)
+            self._methods.append(name)
+            self._frame[name] = 0
+            setattr(obj, method_name, self._timed(getattr(obj, method_name), name))
+
+    def _timed(self, method, name):
+        def timed(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._frame[name] += perf_counter_ns() - start
+        return timed
+
+    def _record(self, name, elapsed):
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = deque(maxlen=self.window)
+            self._max[name] = 0
+        samples.append(elapsed)
+        if elapsed > self._max[name]:
+            self._max[name] = elapsed
+
+    def summary(self):
+        """Texto com média, percentis, máximo e histograma de cada fase, nos quadros da janela."""
+        edges = HISTOGRAM_EDGES_MS
+        labels = ['<%g' % edges[0]] + ['%g-%g' % pair for pair in zip(edges, edges[1:])] + ['>%g' % edges[-1]]
+        lines = [
+            'Perfil de %d quadros (janela: últimos %d), tempos em ms' % (self.frames, self.window),
+            '%-36s %7s %7s %7s %7s %8s  %s' % ('fase', 'média', 'p50', 'p95', 'p99', 'máx', ' '.join(labels)),
+        ]
+        for name, samples in self._samples.items():
+            values = sorted(samples)
+            count = len(values)
+
+            def percentile(fraction):
+                return values[min(count - 1, int(fraction * count))] / 1e6
+
+            histogram = [0] * (len(edges) + 1)
+            bucket = 0
+            for value in values: # Ordenados: as faixas são percorridas uma única vez
+                while bucket < len(edges) and value >= edges[bucket] * 1e6:
+                    bucket += 1
+                histogram[bucket] += 1
+            lines.append('%-36s %7.2f %7.2f %7.2f %7.2f %8.2f  %s' % (
+                name, sum(values) / count / 1e6, percentile(0.5), percentile(0.95), percentile(0.99),
+                self._max[name] / 1e6, ' '.join('%*d' % (len(label), n) for label, n in zip(labels, histogram))))
+        return '\n'.join(lines)
+
+    def dump(self, file=None):
+        """Escreve o resumo em file (por padrão, a saída de erros)."""
+        if self.frames:
+            print(self.summary(), file=file or sys.stderr)
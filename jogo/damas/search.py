@@ -0,0 +1,294 @@
+"""
+Busca alfa-beta (negamax) com aprofundamento iterativo e limite de tempo.
+
+A busca trabalha sobre turnos completos (ver movegen.Turn), de modo que uma
+sequência de capturas conta como um único lance. Cada iteração aprofunda um
+nível; quando o tempo acaba, vale o melhor turno da última iteração completa.
+Os resultados ficam numa tabela de transposição (ver tt.py) que o Searcher
+mantém entre as buscas, aproveitando o trabalho das jogadas anteriores, e os
+turnos de cada nó são examinados na ordem dada por ordering.MoveOrderer.
+
+Como a captura é obrigatória, as folhas em que o lado a jogar tem capturas não
+são avaliadas diretamente: a busca de quiescência segue só as capturas até uma
+posição calma, com um limite próprio de nós por folha.
+"""
+
+import time
+from collections import namedtuple
+
+from .evaluate import WIN_SCORE, evaluate
+from .movegen import generate_moves, generate_turns
+from .ordering import MoveOrderer
+from .tablebase import LOSS, WIN
+from .tt import DEFAULT_TT_MB, EXACT, LOWER, UPPER, TranspositionTable, encode_turn
+
+DEFAULT_TIME_LIMIT_MS = 1000
+MAX_DEPTH = 64
+MATE_THRESHOLD = WIN_SCORE - 1000  # Pontuações acima indicam vitória (ou derrota) forçada, a até 1000 turnos
+QUIESCENCE_NODE_LIMIT = 2000  # Nós de quiescência por folha da busca principal
+_TIME_CHECK_INTERVAL = 1024  # Nós entre consultas ao relógio
+
+# Resultado de uma busca: melhor turno, sua pontuação, profundidade completa alcançada e nós visitados
+SearchResult = namedtuple('SearchResult', 'turn score depth nodes')
+
+
+class _SearchTimeout(Exception):
+    """Interrompe a iteração em andamento quando o tempo da busca se esgota."""
+
+
+def _score_to_tt(score, ply):
+    """Pontuações de vitória são guardadas relativas à posição, não à raiz da busca."""
+    if score > MATE_THRESHOLD:
+        return score + ply
+    if score < -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score, ply):
+    if score > MATE_THRESHOLD:
+        return score - ply
+    if score < -MATE_THRESHOLD:
+        return score + ply
+    return score
+
+
+def _tablebase_score(entry, ply):
+    """Pontuação de um resultado da tablebase (resultado, distância em turnos) a ply turnos da raiz."""
+    result, distance = entry
+    if result == WIN:
+        return WIN_SCORE - ply - distance
+    if result == LOSS:
+        return -WIN_SCORE + ply + distance
+    return 0
+
+
+class Searcher:
+    """
+    Motor de busca do computador. Uma instância pode ser reutilizada entre as
+    jogadas de uma partida, mantendo a tabela de transposição (de tt_mb megabytes)
+    e o histórico da ordenação. Com move_ordering=False os turnos são examinados
+    na ordem de geração, para comparar a contagem de nós. quiescence_nodes limita
+    a busca de quiescência em cada folha (0 a desativa). Com uma tablebase (ver
+    tablebase.py), as posições cobertas por ela têm o valor exato, sem busca.
+    """
+
+    def __init__(self, tt_mb=DEFAULT_TT_MB, move_ordering=True, quiescence_nodes=QUIESCENCE_NODE_LIMIT,
+                 tablebase=None):
+        self.nodes = 0
+        self.quiescence_nodes = 0 # Nós da última busca visitados pela quiescência
+        self.quiescence_limit = quiescence_nodes
+        self._quiescence_budget = 0
+        self.cutoffs = 0 # Cortes beta na última busca
+        self.first_move_cutoffs = 0 # Cortes beta causados pelo primeiro turno examinado
+        self.iteration_nodes = [] # Nós acumulados ao fim de cada iteração completa da última busca
+        self._deadline = None
+        # Evento (threading ou multiprocessing) que, quando ligado, interrompe a busca como o fim do
+        # tempo; usado pelos processos da busca paralela, que não podem receber stop() diretamente
+        self.cancel_event = None
+        self._cancel = None # Evento cancel da busca em andamento
+        self.tt = TranspositionTable(tt_mb)
+        self.ordering = MoveOrderer() if move_ordering else None
+        self.tablebase = tablebase
+        self.tablebase_hits = 0 # Posições da última busca resolvidas pela tablebase
+
+    def search(self, position, time_limit_ms=DEFAULT_TIME_LIMIT_MS, max_depth=MAX_DEPTH, turns=None, cancel=None):
+        """
+        Procura o melhor turno do lado a jogar em position, aprofundando a busca até
+        max_depth ou até time_limit_ms milissegundos. turns restringe os turnos da raiz.
+        cancel é um threading.Event que interrompe a busca quando ligado, mesmo que isso
+        aconteça antes de ela começar. A busca trabalha sobre uma cópia; position não é alterada.
+        Retorna um SearchResult (turn é None se não houver turnos).
+        """
+        root_turns = list(generate_turns(position)) if turns is None else list(turns)
+        if not root_turns:
+            return SearchResult(None, -WIN_SCORE, 0, 0)
+        if len(root_turns) == 1:
+            return SearchResult(root_turns[0], 0, 0, 0) # Turno forçado: não há o que buscar
+        iterations = self.iterate(position, root_turns, time_limit_ms, max_depth, store_root=turns is None,
+                                  cancel=cancel)
+        if not iterations:
+            return SearchResult(root_turns[0], 0, 0, self.nodes)
+        return iterations[-1]._replace(nodes=self.nodes)
+
+    def iterate(self, position, root_turns, time_limit_ms=DEFAULT_TIME_LIMIT_MS, max_depth=MAX_DEPTH,
+                store_root=True, cancel=None):
+        """
+        Aprofundamento iterativo sobre os turnos root_turns da raiz (ao menos um).
+        Retorna a lista dos SearchResult de cada iteração completa, da profundidade 1
+        em diante; a busca paralela usa os resultados de cada profundidade para juntar
+        as buscas dos processos. store_root=False evita guardar na tabela o resultado
+        da raiz, quando root_turns é só uma parte dos turnos legais. cancel: como em search().
+        """
+        self.nodes = 0
+        self.quiescence_nodes = 0
+        self.tablebase_hits = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.iteration_nodes = []
+        self._deadline = time.perf_counter() + time_limit_ms / 1000
+        self._cancel = cancel
+        if cancel is not None and cancel.is_set():
+            return [] # Cancelada antes de começar
+        position = position.copy()
+        root_turns = list(root_turns)
+        if self.ordering is not None:
+            self.ordering.new_search()
+            entry = self.tt.probe(position.key)
+            root_turns = self.ordering.order(position, root_turns, entry[3] if entry else 0)
+
+        iterations = []
+        for depth in range(1, max_depth + 1):
+            try:
+                turn, score = self._search_root(position, root_turns, depth, store_root)
+            except _SearchTimeout:
+                break
+            iterations.append(SearchResult(turn, score, depth, self.nodes))
+            self.iteration_nodes.append(self.nodes)
+            # O melhor turno da iteração anterior é o primeiro a ser examinado na próxima
+            root_turns.remove(turn)
+            root_turns.insert(0, turn)
+            if abs(score) > MATE_THRESHOLD:
+                break # Vitória ou derrota forçada encontrada: aprofundar não muda o resultado
+        return iterations
+
+    def stop(self):
+        """
+        Interrompe a busca em andamento (chamado de outra thread); vale a última iteração completa.
+        Não vale para uma busca que ainda não começou: para essa, use o cancel de search().
+        """
+        self._deadline = 0.0
+
+    def _out_of_time(self):
+        """True se o tempo da busca acabou ou se ela foi cancelada por cancel_event ou pelo seu cancel."""
+        return (time.perf_counter() >= self._deadline or (self.cancel_event is not None and self.cancel_event.is_set())
+                or (self._cancel is not None and self._cancel.is_set()))
+
+    def _search_root(self, position, root_turns, depth, store_root=True):
+        """Uma iteração completa na raiz; retorna (melhor_turno, pontuação)."""
+        alpha = -WIN_SCORE - 1
+        best_turn = root_turns[0]
+        for turn in root_turns:
+            previous_state = position.play(turn)
+            score = -self._negamax(position, depth - 1, -WIN_SCORE - 1, -alpha, 1)
+            position.restore(previous_state)
+            if score > alpha:
+                alpha = score
+                best_turn = turn
+        if store_root:
+            self.tt.store(position.key, depth, EXACT, alpha, encode_turn(best_turn))
+        return best_turn, alpha
+
+    def _negamax(self, position, depth, alpha, beta, ply):
+        """Pontuação da posição para o lado a jogar, buscando depth turnos adiante."""
+        self.nodes += 1
+        if not self.nodes % _TIME_CHECK_INTERVAL and self._out_of_time():
+            raise _SearchTimeout
+
+        if self.tablebase is not None:
+            entry = self.tablebase.probe(position)
+            if entry is not None:
+                self.tablebase_hits += 1
+                return _tablebase_score(entry, ply)
+
+        if depth <= 0:
+            self._quiescence_budget = self.quiescence_limit
+            return self._quiescence(position, alpha, beta, ply)
+
+        key = position.key
+        entry = self.tt.probe(key)
+        if entry is not None and entry[0] >= depth:
+            flag, score = entry[1], _score_from_tt(entry[2], ply)
+            if flag == EXACT or (flag == LOWER and score >= beta) or (flag == UPPER and score <= alpha):
+                return score
+
+        turns = list(generate_turns(position))
+        if not turns:
+            return -WIN_SCORE + ply # Sem movimentos (ou sem peças): derrota, preferindo a mais distante
+        ordering = self.ordering
+        if ordering is not None:
+            turns = ordering.order(position, turns, entry[3] if entry is not None else 0, ply)
+
+        original_alpha = alpha
+        best_score = -WIN_SCORE - 1
+        best_turn = turns[0]
+        for index, turn in enumerate(turns):
+            previous_state = position.play(turn)
+            score = -self._negamax(position, depth - 1, -beta, -alpha, ply + 1)
+            position.restore(previous_state)
+            if score > best_score:
+                best_score = score
+                best_turn = turn
+                if score > alpha:
+                    alpha = score
+                    if score >= beta:
+                        self.cutoffs += 1
+                        if not index:
+                            self.first_move_cutoffs += 1
+                        if ordering is not None:
+                            ordering.record_cutoff(turn, depth, ply)
+                        break
+        if best_score >= beta:
+            flag = LOWER
+        elif best_score > original_alpha:
+            flag = EXACT
+        else:
+            flag = UPPER
+        self.tt.store(key, depth, flag, _score_to_tt(best_score, ply), encode_turn(best_turn))
+        return best_score
+
+    def _quiescence(self, position, alpha, beta, ply):
+        """
+        Avaliação de uma folha: posições calmas são avaliadas estaticamente; se houver
+        capturas (obrigatórias), todas as sequências são buscadas até uma posição calma
+        ou até esgotar o limite de nós da folha.
+        """
+        # Basta a lista de saltos para saber se há lances e se são capturas
+        hops = generate_moves(position)
+        if not hops:
+            return -WIN_SCORE + ply
+        if hops[0][2] is None or self._quiescence_budget <= 0:
+            return evaluate(position)
+
+        best_score = -WIN_SCORE - 1
+        turns = list(generate_turns(position))
+        if self.ordering is not None:
+            turns = self.ordering.order(position, turns, 0, ply)
+        for turn in turns:
+            self.nodes += 1
+            self.quiescence_nodes += 1
+            self._quiescence_budget -= 1
+            if not self.nodes % _TIME_CHECK_INTERVAL and self._out_of_time():
+                raise _SearchTimeout
+            previous_state = position.play(turn)
+            score = -self._quiescence(position, -beta, -alpha, ply + 1)
+            position.restore(previous_state)
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if score >= beta:
+                        break
+        return best_score
+
+    def stats(self):
+        """
+        Estatísticas da última busca: nós (e quantos foram de quiescência), nós de cada iteração completa, fator de ramificação
+        efetivo (razão entre os nós das duas últimas iterações) e fração dos cortes beta
+        causados pelo primeiro turno examinado.
+        """
+        per_iteration = [
+            nodes - previous for nodes, previous in zip(self.iteration_nodes, [0] + self.iteration_nodes)
+        ]
+        branching = None
+        if len(per_iteration) >= 2 and per_iteration[-2]:
+            branching = per_iteration[-1] / per_iteration[-2]
+        return {
+            'nodes': self.nodes,
+            'quiescence_nodes': self.quiescence_nodes,
+            'tablebase_hits': self.tablebase_hits,
+            'iteration_nodes': per_iteration,
+            'branching_factor': branching,
+            'cutoffs': self.cutoffs,
+            'first_move_cutoff_rate': self.first_move_cutoffs / self.cutoffs if self.cutoffs else None,
+        }
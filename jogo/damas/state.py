@@ -0,0 +1,567 @@
+"""
+Estado de uma partida de damas sobre bitboards.
+
+GameState implementa as regras que a classe Game da interface pygame usava
+diretamente sobre a matriz self.board: movimentos obrigatórios, validação,
+execução de jogadas, saltos múltiplos e verificação de vencedor.
+"""
+
+from .background import BackgroundSearch, PonderSearch
+from .bitboard import DIAGONALS, NEIGHBOURHOOD, PLAYERS, Position, SQUARE_TO_RC, iter_squares, popcount, square_of
+from .book import default_book
+from .movegen import attacked_pieces, capture_moves, generate_turns, normal_moves, side_index
+from .search import DEFAULT_TIME_LIMIT_MS, MAX_DEPTH, Searcher
+from .tablebase import DRAW, default_tablebase
+
+
+class GameState:
+    def __init__(self, vs_computer=False, ai_workers=1, ponder=False):
+        self.status = 'Playing'
+        self.turn = 0  # Começa com o jogador humano (azul)
+        self.players = PLAYERS  # Azul primeiro, depois rosa
+        self.selected_piece = None
+        self.jumping = False # Flag para indicar se um salto múltiplo está em andamento
+        self.position = Position.initial()
+        self._board_rows = None # Cache da matriz 8x8 gerada a partir dos bitboards
+        self._undo_stack = [] # Registros de apply_move para undo_move
+        # Casas ocupadas por cada jogador e, entre elas, as damas: {'o': {(linha, coluna), ...}, 'x': {...}}
+        self.piece_squares = {player: set() for player in PLAYERS}
+        self.king_squares = {player: set() for player in PLAYERS}
+        self._sync_piece_squares(self.position.blue | self.position.pink)
+        # Contadores de material, atualizados em capturas e promoções: {'o': n, 'x': n}
+        self.men_count = {player: popcount(self.position.men(side)) for side, player in enumerate(PLAYERS)}
+        self.king_count = {player: popcount(self.position.kings_of(side)) for side, player in enumerate(PLAYERS)}
+        # Movimentos de cada peça do tabuleiro (dos dois lados), mantidos incrementalmente:
+        # {casa: (lado, [(pos_destino, pos_peca_capturada), ...], [(pos_destino, None), ...])}
+        self._piece_moves = {}
+        self._capture_counts = [0, 0] # Quantas peças de cada lado têm alguma captura (entre as calculadas)
+        self._stale_pieces = self.position.blue | self.position.pink # Peças cujos movimentos precisam ser recalculados
+        # mandatory_moves armazenará: {pos_da_peca: [(pos_destino, pos_peca_capturada), ...]}
+        self.mandatory_moves = {}
+        self.vs_computer = vs_computer
+        self.computer_player = 'x'  # O computador joga com as peças rosas ('x')
+        self._current_player_char = self.players[self.turn % 2]
+        self.computer_turn_active = False # Flag para controlar o turno do computador
+        self.ai_move_timer = None # Timer para a jogada da IA
+        self.ai_time_limit_ms = DEFAULT_TIME_LIMIT_MS # Tempo máximo de busca de cada jogada da IA
+        self.ai_max_depth = MAX_DEPTH # Profundidade máxima da busca (limitada em benchmarks, para medir trabalho fixo)
+        self.tablebase = default_tablebase() # Tabelas de finais, se o arquivo tiver sido gerado
+        self.book = default_book() # Livro de aberturas, se o arquivo tiver sido gerado
+        self.ai_workers = ai_workers
+        self._searcher = None # Criado na primeira busca (ver a propriedade searcher)
+        if ai_workers > 1:
+            # Os processos da busca paralela são iniciados já, na thread principal (ver parallel.py)
+            self.searcher.start()
+        self.last_search = None # SearchResult da última jogada da IA
+        self._background_search = None # Busca da IA em segundo plano (ver start_computer_search)
+        self._computer_hops = [] # Saltos do turno escolhido pela IA ainda não aplicados
+        # Pondering: a IA busca as respostas às jogadas prováveis do humano durante o turno dele
+        self.ponder = ponder
+        self._ponder_search = None
+        # Última busca ou pondering interrompido, cuja thread pode ainda estar usando o searcher:
+        # toda busca nova (em segundo plano, pondering ou computer_move) espera por ela
+        self._previous_search = None
+        self._pondered_result = None # Resposta já calculada para a posição atual (acerto do pondering)
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+        self.start_turn() # Movimentos obrigatórios do primeiro turno e, se for o caso, o pondering
+
+    @property
+    def searcher(self):
+        """
+        Motor de busca da IA, criado no primeiro uso e mantido durante toda a partida (a tabela
+        de transposição ocupa vários MB, que uma partida entre humanos não precisa). Com
+        ai_workers > 1, a busca é dividida entre processos (ver parallel.py), compartilhados
+        por todas as partidas da sessão.
+        """
+        if self._searcher is None:
+            if self.ai_workers > 1:
+                from .parallel import shared_searcher # Só aqui: o multiprocessing pesa na importação do jogo
+                self._searcher = shared_searcher(self.ai_workers)
+            else:
+                self._searcher = Searcher(tablebase=self.tablebase)
+        return self._searcher
+
+    @property
+    def board(self):
+        """Matriz 8x8 de caracteres ('-', 'x', 'X', 'o', 'O') equivalente à posição atual (somente leitura)."""
+        if self._board_rows is None:
+            self._board_rows = self.position.to_rows()
+        return self._board_rows
+
+    @property
+    def key(self):
+        """
+        Chave de Zobrist de 64 bits da posição atual (peças e jogador da vez), mantida
+        por XOR a cada movimento, captura e promoção; não exige copiar nem percorrer o tabuleiro.
+        """
+        return self.position.key
+
+    def load_position(self, position):
+        """
+        Recomeça a partida a partir de position (com o seu lado a jogar), descartando o
+        histórico; usado por ferramentas de análise e benchmarks para montar posições de teste.
+        """
+        self.cancel_computer_search()
+        self.status = 'Playing'
+        self.turn = position.side
+        self.selected_piece = None
+        self.jumping = False
+        self.position = position.copy()
+        self._board_rows = None
+        self._undo_stack = []
+        self.piece_squares = {player: set() for player in PLAYERS}
+        self.king_squares = {player: set() for player in PLAYERS}
+        self._sync_piece_squares(self.position.blue | self.position.pink)
+        self.men_count = {player: popcount(self.position.men(side)) for side, player in enumerate(PLAYERS)}
+        self.king_count = {player: popcount(self.position.kings_of(side)) for side, player in enumerate(PLAYERS)}
+        self._piece_moves = {}
+        self._capture_counts = [0, 0]
+        self._stale_pieces = self.position.blue | self.position.pink
+        self.start_turn()
+
+    def _position_for(self, board):
+        """Retorna a posição correspondente a board (a posição atual, ou uma matriz simulada)."""
+        if board is None or board is self._board_rows:
+            return self.position
+        return Position.from_rows(board)
+
+    def update_mandatory_moves(self):
+        """
+        Atualiza o dicionário com todas as jogadas obrigatórias para o jogador atual.
+        Prioriza capturas. Se existirem capturas, apenas as jogadas de captura são obrigatórias.
+        Caso contrário, todos os movimentos normais são permitidos.
+        Só são recalculadas as peças do jogador atual afetadas desde a última atualização.
+        """
+        side = self.turn % 2
+        self.position.side = side
+        pieces = self.position.pieces(side)
+        self._recompute_piece_moves(self._stale_pieces & pieces)
+        kind = 1 if self._capture_counts[side] else 2 # Capturas ou movimentos normais
+        mandatory_moves = {}
+        piece_moves = self._piece_moves
+        for sq in iter_squares(pieces):
+            moves = piece_moves[sq][kind]
+            if moves:
+                mandatory_moves[SQUARE_TO_RC[sq]] = moves
+        self.mandatory_moves = mandatory_moves
+
+    def _update_counts(self, player, captured_king, promoted, sign):
+        """
+        Aplica (sign=1) ou desfaz (sign=-1) nos contadores de material o efeito de um movimento
+        de player: captured_king é None sem captura, ou indica se a peça capturada era dama.
+        """
+        if captured_king is not None:
+            opponent = 'x' if player == 'o' else 'o'
+            if captured_king:
+                self.king_count[opponent] -= sign
+            else:
+                self.men_count[opponent] -= sign
+        if promoted:
+            self.men_count[player] -= sign
+            self.king_count[player] += sign
+
+    def piece_count(self, player_char):
+        """Número de peças (pedras e damas) restantes do jogador."""
+        return self.men_count[player_char] + self.king_count[player_char]
+
+    def _sync_piece_squares(self, changed):
+        """Atualiza piece_squares e king_squares para as casas da máscara changed."""
+        position = self.position
+        for sq in iter_squares(changed):
+            rc = SQUARE_TO_RC[sq]
+            for player in PLAYERS:
+                self.piece_squares[player].discard(rc)
+                self.king_squares[player].discard(rc)
+            side = position.side_of(sq)
+            if side is not None:
+                self.piece_squares[PLAYERS[side]].add(rc)
+                if position.kings >> sq & 1:
+                    self.king_squares[PLAYERS[side]].add(rc)
+
+    def _invalidate_piece_moves(self, changed):
+        """
+        Descarta os movimentos guardados das peças afetadas pela mudança das casas em changed
+        (máscara): as peças nessas casas, as damas nas diagonais que passam por elas e as pedras
+        a até dois passos delas. As demais peças não podem ter seus movimentos alterados.
+        As peças descartadas são recalculadas quando o seu lado precisar delas.
+        """
+        position = self.position
+        piece_moves = self._piece_moves
+        capture_counts = self._capture_counts
+        affected = changed
+        for sq in iter_squares(changed):
+            affected |= (DIAGONALS[sq] & position.kings) | NEIGHBOURHOOD[sq]
+        for sq in iter_squares(affected & ~self._stale_pieces & (position.blue | position.pink | changed)):
+            old = piece_moves.pop(sq, None)
+            if old is not None and old[1]:
+                capture_counts[old[0]] -= 1
+        self._stale_pieces = (self._stale_pieces | affected) & (position.blue | position.pink)
+
+    def _recompute_piece_moves(self, squares):
+        """Calcula e guarda os movimentos das peças nas casas da máscara squares."""
+        position = self.position
+        piece_moves = self._piece_moves
+        capture_counts = self._capture_counts
+        for sq in iter_squares(squares):
+            side = position.side_of(sq)
+            captures = [(SQUARE_TO_RC[d], SQUARE_TO_RC[j]) for d, j in capture_moves(position, sq, side)]
+            normals = [(SQUARE_TO_RC[d], None) for d in normal_moves(position, sq, side)]
+            piece_moves[sq] = (side, captures, normals)
+            if captures:
+                capture_counts[side] += 1
+        self._stale_pieces &= ~squares
+
+    def _piece_capture_moves(self, sq):
+        """Capturas guardadas da peça na casa sq, recalculando-as se estiverem desatualizadas."""
+        if self._stale_pieces >> sq & 1:
+            self._recompute_piece_moves(1 << sq)
+        return self._piece_moves[sq][1]
+
+    def legal_turns(self):
+        """
+        Lista dos turnos completos do jogador atual (ver movegen.Turn): movimentos simples
+        ou sequências inteiras de captura, com as casas percorridas e as peças capturadas.
+        """
+        return list(generate_turns(self.position))
+
+    def _get_capture_moves(self, piece_pos, board, player_to_check):
+        """
+        Função auxiliar para obter todos os movimentos de captura possíveis para uma dada peça
+        em um dado tabuleiro.
+        Retorna uma lista de tuplas: (pos_destino, pos_peca_capturada, pos_peca_inicial).
+        """
+        position = self._position_for(board)
+        sq = square_of(piece_pos[0], piece_pos[1])
+        return [
+            (SQUARE_TO_RC[dest], SQUARE_TO_RC[jumped], piece_pos)
+            for dest, jumped in capture_moves(position, sq, side_index(player_to_check))
+        ]
+
+    def _get_normal_moves(self, piece_pos, board, player_to_check):
+        """
+        Função auxiliar para obter todos os movimentos normais (não de captura) para uma dada peça
+        em um dado tabuleiro.
+        Retorna uma lista de pos_destino.
+        """
+        position = self._position_for(board)
+        sq = square_of(piece_pos[0], piece_pos[1])
+        return [SQUARE_TO_RC[dest] for dest in normal_moves(position, sq, side_index(player_to_check))]
+
+    def is_valid_move(self, player_char, piece_pos, dest_row, dest_col):
+        """
+        Verifica se um movimento de piece_pos para (dest_row, dest_col) é válido
+        de acordo com os movimentos obrigatórios atuais.
+        Retorna (True, pos_peca_capturada) se válido, (False, None) caso contrário.
+        """
+        start_pos_tuple = (piece_pos[0], piece_pos[1])
+        if start_pos_tuple not in self.mandatory_moves:
+            return False, None
+
+        for allowed_dest, jumped_piece_pos in self.mandatory_moves[start_pos_tuple]:
+            if allowed_dest[0] == dest_row and allowed_dest[1] == dest_col:
+                return True, jumped_piece_pos
+        return False, None
+
+    def get_possible_moves(self, piece_pos):
+        """
+        Retorna uma lista de posições de destino válidas para a dada piece_pos,
+        com base nos mandatory_moves atuais do jogo.
+        Retorna uma tupla: (lista de pos_destino, booleano indicando se há saltos envolvidos)
+        """
+        piece_pos_tuple = (piece_pos[0], piece_pos[1])
+        if piece_pos_tuple in self.mandatory_moves:
+            destinations = [move[0] for move in self.mandatory_moves[piece_pos_tuple]]
+            is_jump_possible = any(move[1] is not None for move in self.mandatory_moves[piece_pos_tuple])
+            return destinations, is_jump_possible
+        return [], False
+
+    def apply_move(self, piece_pos, dest_pos, jumped_piece_pos=None):
+        """
+        Aplica um movimento (um único salto, no caso de capturas) de forma reversível.
+        Move a peça, remove a capturada, promove a dama e decide se o mesmo jogador
+        continua saltando; caso contrário, passa o turno. O necessário para desfazer
+        o movimento é empilhado em self._undo_stack (ver undo_move).
+        Não recalcula mandatory_moves.
+        Retorna uma tupla (promovida_a_dama, continua_saltando).
+        """
+        position = self.position
+        origin = square_of(piece_pos[0], piece_pos[1])
+        dest = square_of(dest_pos[0], dest_pos[1])
+        jumped = square_of(jumped_piece_pos[0], jumped_piece_pos[1]) if jumped_piece_pos else None
+        captured_king = jumped is not None and bool(position.kings >> jumped & 1)
+
+        player = PLAYERS[position.side_of(origin)]
+        promoted = position.move(origin, dest, jumped)
+        self._update_counts(player, captured_king if jumped is not None else None, promoted, 1)
+        self._undo_stack.append(
+            (origin, dest, jumped, captured_king, promoted, self.turn, self.jumping, self.selected_piece)
+        )
+        self._board_rows = None
+        changed = (1 << origin) | (1 << dest) | (1 << jumped if jumped is not None else 0)
+        self._sync_piece_squares(changed)
+        self._invalidate_piece_moves(changed)
+
+        # Verifica saltos consecutivos com a mesma peça (já promovida, se for o caso)
+        if jumped is not None and self._piece_capture_moves(dest):
+            self.selected_piece = [dest_pos[0], dest_pos[1]]
+            self.jumping = True
+            return promoted, True
+
+        self.selected_piece = None
+        self.jumping = False
+        self.turn += 1
+        position.side = self.turn % 2
+        return promoted, False
+
+    def undo_move(self):
+        """Desfaz o último movimento aplicado por apply_move, restaurando turno e estado de salto."""
+        origin, dest, jumped, captured_king, promoted, turn, jumping, selected_piece = self._undo_stack.pop()
+        self.position.unmove(origin, dest, jumped, captured_king, promoted)
+        self._update_counts(PLAYERS[self.position.side_of(origin)], captured_king if jumped is not None else None,
+                            promoted, -1)
+        self.position.side = turn % 2
+        self.turn = turn
+        self.jumping = jumping
+        self.selected_piece = selected_piece
+        self._board_rows = None
+        changed = (1 << origin) | (1 << dest) | (1 << jumped if jumped is not None else 0)
+        self._sync_piece_squares(changed)
+        self._invalidate_piece_moves(changed)
+
+    def make_move(self, player_char, piece_pos, dest_row, dest_col, jumped_piece_pos=None):
+        """
+        Executa um movimento no tabuleiro.
+        Lida com o movimento da peça, captura de peça e promoção a dama (via apply_move).
+        Verifica saltos consecutivos.
+        """
+        _, continues = self.apply_move(piece_pos, (dest_row, dest_col), jumped_piece_pos)
+        if continues:
+            # Mantém o turno do mesmo jogador e atualiza mandatory_moves *apenas* para esta peça
+            self.mandatory_moves = {(dest_row, dest_col): self._piece_capture_moves(square_of(dest_row, dest_col))}
+            return # Permanece no mesmo turno, aguardando o próximo salto
+
+        # O turno já foi passado por apply_move
+        self.start_turn()
+
+        winner = self.check_winner()
+        if winner is not None:
+            self.status = 'Game Over'
+            self.cancel_computer_search() # O pondering iniciado por start_turn não serve mais
+
+    def computer_move(self, on_hop=None):
+        """
+        Executa o turno do computador: escolhe o turno completo com a busca alfa-beta
+        (ver search.Searcher), limitada a ai_time_limit_ms, e o aplica salto por salto
+        com make_move. Se on_hop for dado, é chamado antes de cada salto após o primeiro,
+        para a interface mostrar a sequência de capturas.
+        """
+        if self.status != "Playing":
+            return
+
+        current_player_char = self.players[self.turn % 2]
+        if current_player_char != self.computer_player:
+            return
+
+        # Cada turno gerado já contém a sequência completa de saltos, então não é preciso
+        # reavaliar o tabuleiro a cada salto
+        book_result = self._book_result()
+        if book_result is not None:
+            self.last_search = book_result
+        elif self._pondered_result is not None:
+            self.last_search, self._pondered_result = self._pondered_result, None
+        else:
+            if self._previous_search is not None:
+                self._previous_search.wait() # O searcher só fica livre quando a busca interrompida termina
+            self.last_search = self.searcher.search(self.position, self.ai_time_limit_ms, self.ai_max_depth,
+                                                    turns=self._computer_root_turns())
+        best_turn = self.last_search.turn
+        if best_turn:
+            # Executa o turno escolhido, salto por salto
+            path, captured = best_turn.path, best_turn.captured
+            for hop in range(len(path) - 1):
+                if hop > 0 and on_hop is not None:
+                    on_hop()
+                dest_row, dest_col = SQUARE_TO_RC[path[hop + 1]]
+                self.make_move(self.computer_player, SQUARE_TO_RC[path[hop]], dest_row, dest_col,
+                               SQUARE_TO_RC[captured[hop]] if captured else None)
+        elif self._current_player_char == self.computer_player:
+            # Nenhum movimento foi feito: força o próximo turno se a IA não conseguir jogar
+            self.next_turn()
+        # O turno já foi passado por make_move no último salto
+        self.computer_turn_active = False
+        self.ai_move_timer = None
+
+    def _computer_root_turns(self):
+        """Turnos da raiz para a IA: None (todos), ou só os da peça em um salto contínuo."""
+        if self.jumping and self.selected_piece:
+            # Se estivermos em um salto contínuo, a IA só pode mover a peça selecionada
+            selected_square = square_of(self.selected_piece[0], self.selected_piece[1])
+            return [turn for turn in self.legal_turns() if turn.path[0] == selected_square]
+        return None
+
+    def _book_result(self):
+        """Turno do livro de aberturas para a posição atual (como SearchResult), ou None."""
+        if self.book is None or self.jumping:
+            return None
+        return self.book.search(self.position)
+
+    def start_computer_search(self):
+        """
+        Inicia a busca da jogada do computador numa thread (ver background.BackgroundSearch),
+        se for a vez dele e ainda não houver busca ou turno pendente. A interface consulta
+        o resultado com poll_computer_search() sem travar o laço de desenho.
+        """
+        if (self.status != "Playing" or self._current_player_char != self.computer_player
+                or self._background_search is not None or self._computer_hops):
+            return
+        book_result = self._book_result()
+        if book_result is not None:
+            self._queue_computer_turn(book_result) # Posição do livro: nenhuma busca é necessária
+            return
+        if self._pondered_result is not None:
+            # A jogada do humano foi prevista: a resposta já está pronta
+            self._queue_computer_turn(self._pondered_result)
+            self._pondered_result = None
+            return
+        self._background_search = BackgroundSearch(
+            self.searcher, self.position, self.ai_time_limit_ms, self._computer_root_turns(), self.ai_max_depth,
+            after=self._previous_search
+        )
+
+    def poll_computer_search(self):
+        """
+        Verifica se a busca em segundo plano terminou. Quando termina, guarda os saltos do
+        turno escolhido (aplicados um a um por play_computer_hop) e retorna True.
+        """
+        search = self._background_search
+        if search is None:
+            return bool(self._computer_hops)
+        result = search.poll()
+        if result is None:
+            return False
+        self._background_search = None
+        if search.key != self.position.key:
+            return False # A posição mudou durante a busca: o resultado é descartado
+        return self._queue_computer_turn(result)
+
+    def _queue_computer_turn(self, result):
+        """Guarda os saltos do turno de result para play_computer_hop; retorna False se não houver turno."""
+        self.last_search = result
+        if result.turn is None:
+            # Sem turnos: o turno passa como em computer_move
+            if self._current_player_char == self.computer_player:
+                self.next_turn()
+            return False
+        path, captured = result.turn.path, result.turn.captured
+        self._computer_hops = [
+            (SQUARE_TO_RC[path[hop]], SQUARE_TO_RC[path[hop + 1]], SQUARE_TO_RC[captured[hop]] if captured else None)
+            for hop in range(len(path) - 1)
+        ]
+        return True
+
+    def play_computer_hop(self):
+        """Aplica o próximo salto do turno escolhido pela IA. Retorna True se ainda restarem saltos."""
+        origin, (dest_row, dest_col), jumped = self._computer_hops.pop(0)
+        self.make_move(self.computer_player, origin, dest_row, dest_col, jumped)
+        if self._computer_hops:
+            return True
+        self.computer_turn_active = False
+        self.ai_move_timer = None
+        return False
+
+    def cancel_computer_search(self):
+        """
+        Descarta a busca em segundo plano, o pondering e os saltos pendentes
+        (por exemplo, ao sair da partida).
+        """
+        if self._background_search is not None:
+            self._background_search.cancel()
+            self._previous_search, self._background_search = self._background_search, None
+        if self._ponder_search is not None:
+            self._ponder_search.stop()
+            self._previous_search, self._ponder_search = self._ponder_search, None
+        self._pondered_result = None
+        self._computer_hops = []
+
+    def _start_pondering(self):
+        """Começa a buscar, em segundo plano, as respostas às jogadas possíveis do humano."""
+        if self._ponder_search is None:
+            self._ponder_search = PonderSearch(self.searcher, self.position, self.ai_time_limit_ms,
+                                               after=self._previous_search)
+
+    def _finish_pondering(self):
+        """
+        Encerra o pondering quando o humano joga, sem esperar a thread dele. Se a posição
+        atual foi examinada, a resposta fica em _pondered_result; caso contrário, o trabalho
+        é descartado.
+        """
+        ponder_search, self._ponder_search = self._ponder_search, None
+        ponder_search.stop()
+        self._previous_search = ponder_search
+        result = ponder_search.result_for(self.position.key)
+        if result is not None and result.turn is not None and self.computer_turn_active:
+            self._pondered_result = result
+            self.ponder_hits += 1
+        else:
+            self.ponder_misses += 1
+
+    def next_turn(self):
+        """Avança o turno para o próximo jogador e atualiza os movimentos obrigatórios."""
+        self.turn += 1
+        self.position.side = self.turn % 2
+        self.start_turn()
+
+    def start_turn(self):
+        """Atualiza o jogador atual, os movimentos obrigatórios e a vez do computador no início de um turno."""
+        self._current_player_char = self.players[self.turn % 2]
+        self.update_mandatory_moves()
+        # Se o turno for do computador, ativa a flag
+        self.computer_turn_active = self.vs_computer and self._current_player_char == self.computer_player
+        self.ai_move_timer = None
+        self._pondered_result = None
+        if self._ponder_search is not None:
+            self._finish_pondering()
+        if self.ponder and self.vs_computer and not self.computer_turn_active and self.status == 'Playing':
+            self._start_pondering()
+
+    def check_winner(self):
+        """
+        Verifica se há um vencedor ou um empate.
+        Retorna 'o' se o azul vencer, 'x' se o rosa vencer, 'tie' se for um empate, None caso contrário.
+        """
+        if not self.piece_count('x'):
+            return 'o' # Azul vence (todas as peças rosas capturadas)
+        if not self.piece_count('o'):
+            return 'x' # Rosa vence (todas as peças azuis capturadas)
+
+        # Se o jogador atual não tiver movimentos válidos, ele perde
+        if not self.has_possible_move():
+            if self.players[self.turn % 2] == 'o':
+                return 'x'
+            else:
+                return 'o'
+
+        # Só damas no tabuleiro e a tablebase garante o empate: ninguém pode forçar a vitória.
+        # No meio de uma sequência de capturas a posição ainda não é a do fim do turno
+        if (self.tablebase is not None and not self.jumping
+                and not (self.men_count['o'] or self.men_count['x'])):
+            entry = self.tablebase.probe(self.position)
+            if entry is not None and entry[0] == DRAW:
+                return 'tie'
+
+        return None
+
+    def has_possible_move(self):
+        """Verifica se o jogador atual tem algum movimento possível (normal ou de captura)."""
+        return bool(self.mandatory_moves)
+
+    def is_position_safe(self, pos, board, current_player_char):
+        """
+        Verifica se uma dada posição (pos) no tabuleiro é segura para a peça
+        pertencente a current_player_char. Uma posição é insegura se uma peça
+        do oponente puder capturá-la em seu próximo turno.
+        """
+        position = self._position_for(board)
+        target = square_of(pos[0], pos[1])
+        return not attacked_pieces(position, 1 - side_index(current_player_char)) >> target & 1
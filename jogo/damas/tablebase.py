@@ -0,0 +1,333 @@
+"""
+Tabelas de finais (tablebase) por análise retrógrada.
+
+Para cada combinação de material com até N peças (pedras e damas de cada lado)
+é calculado, para todas as posições e os dois lados a jogar, se o lado a jogar
+vence, perde ou empata com jogo perfeito, e em quantos turnos. As regras são as
+do jogo (damas voadoras, captura obrigatória, turno = sequência completa de
+capturas), pois os lances vêm de generate_turns.
+
+Cada posição ocupa um byte, num índice perfeito: as casas de cada grupo de
+peças (damas azuis, pedras azuis, damas rosas, pedras rosas) são numeradas pelo
+sistema combinatório de números, entre as casas ainda livres. O byte vale 0 para
+empate; caso contrário, d = byte - 1 é a distância em turnos até o fim do jogo,
+vencendo se d for ímpar e perdendo se for par. Distâncias acima de MAX_DISTANCE
+são guardadas como a maior distância de mesma paridade, que conserva o resultado.
+
+O arquivo tem um cabeçalho (assinatura, versão, N, número de tabelas e a posição
+de cada tabela) seguido das tabelas, e é lido com mmap: a consulta é O(1) e não
+há custo de carga além do cabeçalho.
+
+Geração (a partir da pasta jogo/):
+    python -m damas.tablebase --pieces 3
+"""
+
+import mmap
+import os
+import struct
+from itertools import product
+from math import comb
+
+from .bitboard import BOTTOM_ROW, TOP_ROW, Position, iter_squares
+from .movegen import generate_turns
+
+MAGIC = b'DMTB'
+VERSION = 1
+DEFAULT_MAX_PIECES = 3
+DEFAULT_TABLEBASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tablebase.bin')
+
+# Resultado para o lado a jogar
+DRAW, WIN, LOSS = 0, 1, 2
+MAX_DISTANCE = 254
+
+_HEADER = struct.Struct('<4sHHI')  # Assinatura, versão, N, número de tabelas
+_ENTRY = struct.Struct('<4BQ')  # Material (pedras e damas azuis, pedras e damas rosas), início da tabela
+
+# _COMB[n][k] = C(n, k), para n e k até 32
+_COMB = tuple(tuple(comb(n, k) for k in range(33)) for n in range(33))
+
+
+def material(position):
+    """Material da posição: (pedras azuis, damas azuis, pedras rosas, damas rosas)."""
+    kings = position.kings
+    return (
+        (position.blue & ~kings).bit_count(), (position.blue & kings).bit_count(),
+        (position.pink & ~kings).bit_count(), (position.pink & kings).bit_count(),
+    )
+
+
+def _groups(signature):
+    """Tamanho de cada grupo de peças, na ordem do índice: damas azuis, pedras azuis, damas rosas, pedras rosas."""
+    blue_men, blue_kings, pink_men, pink_kings = signature
+    return (blue_kings, blue_men, pink_kings, pink_men)
+
+
+def table_size(signature):
+    """Número de posições de um lado a jogar para o material dado."""
+    size = 1
+    free = 32
+    for count in _groups(signature):
+        size *= _COMB[free][count]
+        free -= count
+    return size
+
+
+def position_index(position, signature):
+    """Índice da posição na tabela do seu material (incluindo o lado a jogar)."""
+    kings = position.kings
+    index = 0
+    previous = 0
+    free = 32
+    for mask in (position.blue & kings, position.blue & ~kings, position.pink & kings, position.pink & ~kings):
+        rank = 0
+        count = 0
+        for sq in iter_squares(mask):
+            count += 1
+            # Número da casa entre as casas não ocupadas pelos grupos anteriores
+            rank += _COMB[sq - (previous & ((1 << sq) - 1)).bit_count()][count]
+        index = index * _COMB[free][count] + rank
+        previous |= mask
+        free -= count
+    return index + position.side * table_size(signature)
+
+
+def position_at(signature, index):
+    """Posição correspondente ao índice (inverso de position_index)."""
+    size = table_size(signature)
+    side, index = divmod(index, size)
+    groups = _groups(signature)
+    # Separa o índice nos postos de cada grupo, do último para o primeiro
+    frees = []
+    free = 32
+    for count in groups:
+        frees.append(free)
+        free -= count
+    ranks = []
+    for count, free in zip(reversed(groups), reversed(frees)):
+        index, rank = divmod(index, _COMB[free][count])
+        ranks.append(rank)
+    ranks.reverse()
+
+    free_squares = list(range(32))
+    masks = []
+    for count, rank in zip(groups, ranks):
+        chosen = []
+        for position_in_group in range(count, 0, -1):
+            c = position_in_group - 1
+            while _COMB[c + 1][position_in_group] <= rank:
+                c += 1
+            rank -= _COMB[c][position_in_group]
+            chosen.append(c)
+        mask = 0
+        for c in chosen:
+            mask |= 1 << free_squares[c]
+        for c in sorted(chosen, reverse=True):
+            del free_squares[c]
+        masks.append(mask)
+    blue_kings, blue_men, pink_kings, pink_men = masks
+    return Position(blue=blue_kings | blue_men, pink=pink_kings | pink_men,
+                    kings=blue_kings | pink_kings, side=side)
+
+
+def encode_value(result, distance):
+    """
+    Byte da tabela para o resultado (do lado a jogar) e a distância em turnos (ímpar para
+    vitória, par para derrota), limitada a MAX_DISTANCE ou MAX_DISTANCE - 1, conforme a paridade.
+    """
+    if result == DRAW:
+        return 0
+    if distance > MAX_DISTANCE:
+        distance = MAX_DISTANCE - (distance - MAX_DISTANCE) % 2
+    return distance + 1
+
+
+def decode_value(value):
+    """(resultado, distância) de um byte da tabela."""
+    if not value:
+        return DRAW, 0
+    distance = value - 1
+    return (WIN if distance % 2 else LOSS), distance
+
+
+def signatures(max_pieces):
+    """
+    Materiais com até max_pieces peças (ao menos uma de cada lado), na ordem de geração:
+    menos peças primeiro e, com o mesmo número de peças, menos pedras primeiro, pois
+    capturas levam a tabelas menores e promoções trocam uma pedra por uma dama.
+    """
+    result = [
+        signature for signature in product(range(max_pieces + 1), repeat=4)
+        if sum(signature) <= max_pieces and signature[0] + signature[1] and signature[2] + signature[3]
+    ]
+    result.sort(key=lambda signature: (sum(signature), signature[0] + signature[2], signature))
+    return result
+
+
+def _valid(position):
+    """Pedras não podem estar na linha de promoção do seu lado (já teriam virado damas)."""
+    kings = position.kings
+    return not (position.blue & ~kings & TOP_ROW or position.pink & ~kings & BOTTOM_ROW)
+
+
+def build_table(signature, tables):
+    """
+    Calcula a tabela do material signature por análise retrógrada. tables contém as
+    tabelas já calculadas ({material: bytearray}), para as quais levam capturas e promoções.
+    """
+    size = 2 * table_size(signature)
+    values = bytearray(size)
+    final = bytearray(size) # 1 quando o valor da posição já está decidido
+    parents = [None] * size # Posições desta tabela que levam a cada posição
+    pending = [0] * size # Filhos desta tabela ainda não decididos (todos vitórias até agora)
+    loss_distance = [0] * size # Maior distância entre os filhos vencedores conhecidos
+    cannot_lose = bytearray(size) # Algum filho de fora da tabela é empate ou derrota do oponente
+    buckets = {} # {distância: [(índice, resultado), ...]}, processados em ordem crescente
+
+    def schedule(index, result, distance):
+        buckets.setdefault(distance, []).append((index, result))
+
+    for index in range(size):
+        position = position_at(signature, index)
+        if not _valid(position):
+            final[index] = 1
+            continue
+        best_win = None
+        children = 0
+        for turn in generate_turns(position):
+            children += 1
+            previous_state = position.play(turn)
+            if not position.pieces(position.side):
+                child_result, child_distance = LOSS, 0 # O oponente ficou sem peças
+            else:
+                child_signature = material(position)
+                if child_signature == signature:
+                    child_index = position_index(position, signature)
+                    if parents[child_index] is None:
+                        parents[child_index] = [index]
+                    else:
+                        parents[child_index].append(index)
+                    pending[index] += 1
+                    position.restore(previous_state)
+                    continue
+                child_result, child_distance = decode_value(
+                    tables[child_signature][position_index(position, child_signature)]
+                )
+            position.restore(previous_state)
+            if child_result == LOSS:
+                if best_win is None or child_distance + 1 < best_win:
+                    best_win = child_distance + 1
+            elif child_result == WIN:
+                loss_distance[index] = max(loss_distance[index], child_distance + 1)
+            else:
+                cannot_lose[index] = 1
+        if not children:
+            schedule(index, LOSS, 0) # Sem lances: o lado a jogar perde
+        elif best_win is not None:
+            cannot_lose[index] = 1
+            schedule(index, WIN, best_win)
+        elif not pending[index] and not cannot_lose[index]:
+            schedule(index, LOSS, loss_distance[index])
+
+    # Propagação em ordem crescente de distância: a primeira decisão de cada posição é a ótima
+    distance = 0
+    while buckets:
+        for index, result in buckets.pop(distance, ()):
+            if final[index]:
+                continue
+            final[index] = 1
+            values[index] = encode_value(result, distance)
+            for parent in parents[index] or ():
+                if final[parent]:
+                    continue
+                if result == LOSS:
+                    schedule(parent, WIN, distance + 1)
+                else:
+                    pending[parent] -= 1
+                    loss_distance[parent] = max(loss_distance[parent], distance + 1)
+                    if not pending[parent] and not cannot_lose[parent]:
+                        schedule(parent, LOSS, loss_distance[parent])
+        distance += 1
+    return values # Posições não decididas ficam como empate (0)
+
+
+def build(max_pieces=DEFAULT_MAX_PIECES, path=DEFAULT_TABLEBASE_PATH, progress=None):
+    """Gera todas as tabelas com até max_pieces peças e grava o arquivo em path."""
+    tables = {}
+    for signature in signatures(max_pieces):
+        tables[signature] = build_table(signature, tables)
+        if progress is not None:
+            progress(signature, tables[signature])
+
+    offset = _HEADER.size + _ENTRY.size * len(tables)
+    with open(path, 'wb') as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, max_pieces, len(tables)))
+        for signature, values in tables.items():
+            file.write(_ENTRY.pack(*signature, offset))
+            offset += len(values)
+        for values in tables.values():
+            file.write(values)
+
+
+class Tablebase:
+    """Consulta às tabelas de um arquivo gerado por build(), mapeado em memória."""
+
+    def __init__(self, path=DEFAULT_TABLEBASE_PATH):
+        self._file = open(path, 'rb')
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.max_pieces, count = _HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError('%s não é uma tablebase do jogo (versão %d)' % (path, VERSION))
+        # {material: início da tabela no arquivo}
+        self._offsets = {}
+        for entry in range(count):
+            *signature, offset = _ENTRY.unpack_from(self._data, _HEADER.size + entry * _ENTRY.size)
+            self._offsets[tuple(signature)] = offset
+
+    def probe(self, position):
+        """
+        Resultado exato da posição para o lado a jogar: (WIN/LOSS/DRAW, distância em turnos),
+        ou None se o material da posição não estiver nas tabelas.
+        """
+        if (position.blue | position.pink).bit_count() > self.max_pieces:
+            return None
+        signature = material(position)
+        offset = self._offsets.get(signature)
+        if offset is None:
+            return None
+        return decode_value(self._data[offset + position_index(position, signature)])
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+
+_default_tablebase = False  # Ainda não procurada
+
+
+def default_tablebase():
+    """Tablebase do arquivo padrão, aberta uma única vez por processo, ou None se ele não existir."""
+    global _default_tablebase
+    if _default_tablebase is False:
+        _default_tablebase = Tablebase() if os.path.exists(DEFAULT_TABLEBASE_PATH) else None
+    return _default_tablebase
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Gera as tabelas de finais do Jogo de Damas.')
+    parser.add_argument('--pieces', type=int, default=DEFAULT_MAX_PIECES, help='número máximo de peças')
+    parser.add_argument('--out', default=DEFAULT_TABLEBASE_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+
+    def report(signature, values):
+        wins = sum(1 for value in values if value and (value - 1) % 2)
+        print('%s: %d posições, %d vitórias, %d empates (%.0fs)' % (
+            signature, len(values), wins, values.count(0), time.perf_counter() - start))
+
+    build(args.pieces, args.out, report)
+    print('Tablebase gravada em', args.out)
@@ -0,0 +1,266 @@
+"""
+Torneio entre versões da IA, sem interface gráfica.
+
+Dois jogadores, descritos por especificações de texto, jogam partidas entre si
+num conjunto de processos. As partidas vêm em pares: as duas partidas de um par
+começam pela mesma abertura aleatória (alguns turnos sorteados a partir da posição
+inicial), com as cores trocadas. Cada partida termina quando um lado fica sem
+lances, quando a tablebase (se houver) decide o final, ou empatada após um
+limite de turnos.
+
+Especificações de jogador:
+    greedy                         a IA gulosa de ai.choose_turn
+    search                         Searcher com as opções padrão
+    search:time=100,depth=6,tt=4   opções separadas por vírgulas:
+        time        tempo por jogada (ms)
+        depth       profundidade máxima (com time alto, torna as partidas reproduzíveis)
+        tt          tamanho da tabela de transposição (MB)
+        ordering    0 para desligar a ordenação de lances
+        quiescence  nós de quiescência por folha (0 desliga)
+        tablebase   0 para não usar a tablebase na busca
+        book        1 para usar o livro de aberturas (após a abertura aleatória)
+
+O resultado de cada partida é gravado como uma linha JSON, e ao final é mostrado
+o placar do primeiro jogador com a diferença de Elo estimada, sua margem de erro
+(95%) e a probabilidade de superioridade (LOS).
+
+Exemplo (a partir da pasta jogo/):
+    python -m damas.tournament "search:time=100" "search:time=100,ordering=0" --games 200 --out torneio.jsonl
+"""
+
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .ai import choose_turn
+from .bitboard import PLAYERS, Position
+from .book import default_book
+from .movegen import generate_turns
+from .search import DEFAULT_TIME_LIMIT_MS, MAX_DEPTH, QUIESCENCE_NODE_LIMIT, Searcher
+from .tablebase import DRAW, WIN, default_tablebase
+from .tt import DEFAULT_TT_MB
+
+DEFAULT_OPENING_PLIES = 4
+DEFAULT_MAX_PLIES = 200  # Turnos até a partida ser declarada empatada
+
+_players = {}  # Jogadores já criados no processo, por (lado, especificação)
+
+
+def parse_spec(spec):
+    """Separa a especificação de um jogador em (tipo, {opção: valor inteiro})."""
+    kind, _, options = spec.partition(':')
+    if kind not in ('greedy', 'search'):
+        raise ValueError('jogador desconhecido: %r' % spec)
+    parsed = {}
+    for option in filter(None, options.split(',')):
+        name, _, value = option.partition('=')
+        if name not in ('time', 'depth', 'tt', 'ordering', 'quiescence', 'tablebase', 'book'):
+            raise ValueError('opção desconhecida em %r: %r' % (spec, name))
+        parsed[name] = int(value)
+    return kind, parsed
+
+
+class _SearchPlayer:
+    """Jogador com um Searcher configurado pela especificação."""
+
+    def __init__(self, options):
+        self.time_limit_ms = options.get('time', DEFAULT_TIME_LIMIT_MS)
+        self.max_depth = options.get('depth', MAX_DEPTH)
+        self.book = default_book() if options.get('book', 0) else None
+        self.searcher = Searcher(
+            options.get('tt', DEFAULT_TT_MB),
+            move_ordering=bool(options.get('ordering', 1)),
+            quiescence_nodes=options.get('quiescence', QUIESCENCE_NODE_LIMIT),
+            tablebase=default_tablebase() if options.get('tablebase', 1) else None,
+        )
+
+    def new_game(self):
+        self.searcher.tt.clear()
+
+    def __call__(self, position, turns):
+        if self.book is not None:
+            turn = self.book.choose(position)
+            if turn is not None:
+                return turn
+        return self.searcher.search(position, self.time_limit_ms, self.max_depth, turns=turns).turn
+
+
+class _GreedyPlayer:
+    def new_game(self):
+        pass
+
+    def __call__(self, position, turns):
+        return choose_turn(position, turns)
+
+
+def make_player(spec, side=0):
+    """
+    Jogador da especificação para o lado side: chamável (posição, turnos) -> turno, com
+    new_game() entre partidas. Cada lado tem a sua instância (e o seu searcher), mesmo
+    quando as duas especificações são iguais.
+    """
+    player = _players.get((side, spec))
+    if player is None:
+        kind, options = parse_spec(spec)
+        player = _players[side, spec] = _SearchPlayer(options) if kind == 'search' else _GreedyPlayer()
+    return player
+
+
+def random_opening(seed, plies):
+    """Turnos sorteados a partir da posição inicial: lista de caminhos (casas percorridas)."""
+    rng = random.Random(seed)
+    position = Position.initial()
+    opening = []
+    for _ in range(plies):
+        turns = list(generate_turns(position))
+        if not turns:
+            break
+        turn = rng.choice(turns)
+        position.play(turn)
+        opening.append(turn.path)
+    return opening
+
+
+def play_game(game, blue_spec, pink_spec, opening, max_plies=DEFAULT_MAX_PLIES):
+    """
+    Joga uma partida a partir da abertura dada (lista de caminhos) e retorna o seu registro:
+    {'game', 'blue', 'pink', 'opening', 'winner' ('o', 'x' ou None), 'reason', 'plies', 'seconds'}.
+    """
+    start = time.perf_counter()
+    players = (make_player(blue_spec, 0), make_player(pink_spec, 1))
+    for player in players:
+        player.new_game()
+    tablebase = default_tablebase()
+    position = Position.initial()
+    for path in opening:
+        position.play(next(turn for turn in generate_turns(position) if turn.path == path))
+
+    winner = None
+    reason = 'limite de turnos'
+    plies = len(opening)
+    while plies < max_plies:
+        turns = list(generate_turns(position))
+        if not turns:
+            winner, reason = 1 - position.side, 'sem lances'
+            break
+        if tablebase is not None:
+            entry = tablebase.probe(position)
+            if entry is not None:
+                result = entry[0]
+                if result != DRAW:
+                    winner = position.side if result == WIN else 1 - position.side
+                reason = 'tablebase'
+                break
+        position.play(players[position.side](position, turns))
+        plies += 1
+
+    return {
+        'game': game,
+        'blue': blue_spec,
+        'pink': pink_spec,
+        'opening': [list(path) for path in opening],
+        'winner': PLAYERS[winner] if winner is not None else None,
+        'reason': reason,
+        'plies': plies,
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+def elo_summary(wins, draws, losses):
+    """
+    Estatísticas do placar (do ponto de vista do primeiro jogador):
+    (pontuação média, diferença de Elo, margem de erro de 95% do Elo, LOS).
+    """
+    games = wins + draws + losses
+    if not games:
+        return 0.5, 0.0, math.inf, 0.5
+    score = (wins + 0.5 * draws) / games
+    # Desvio padrão da pontuação por partida, para a margem de erro
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    margin_score = 1.96 * math.sqrt(variance / games)
+
+    def elo(p):
+        if p <= 0:
+            return -math.inf
+        if p >= 1:
+            return math.inf
+        return -400 * math.log10(1 / p - 1)
+
+    difference = elo(score) + 0.0 # Evita -0
+    if 0 < score < 1:
+        margin = (elo(min(1.0, score + margin_score)) - elo(max(0.0, score - margin_score))) / 2
+    else:
+        margin = math.inf # Sem vitórias ou sem derrotas, não há como estimar a diferença
+    decisive = wins + losses
+    los = 0.5 * (1 + math.erf((wins - losses) / math.sqrt(2 * decisive))) if decisive else 0.5
+    return score, difference, margin, los
+
+
+def run(first, second, games=100, workers=None, opening_plies=DEFAULT_OPENING_PLIES,
+        max_plies=DEFAULT_MAX_PLIES, seed=0, out=None, progress=None):
+    """
+    Joga games partidas entre os jogadores first e second (especificações) em workers
+    processos e retorna (vitórias, empates, derrotas) de first. Os registros das partidas
+    são gravados em out (um JSON por linha), se dado, na ordem em que terminam.
+    """
+    tasks = []
+    for game in range(games):
+        pair = game // 2
+        opening = random_opening(seed * 1000003 + pair, opening_plies)
+        # Partidas pares: first joga de azul; ímpares: as cores são trocadas
+        blue, pink = (first, second) if game % 2 == 0 else (second, first)
+        tasks.append((game, blue, pink, opening, max_plies))
+
+    wins = draws = losses = 0
+    log = open(out, 'w') if out else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+            futures = [executor.submit(play_game, *task) for task in tasks]
+            for done, future in enumerate(as_completed(futures), 1):
+                record = future.result()
+                if record['winner'] is None:
+                    draws += 1
+                elif PLAYERS.index(record['winner']) == record['game'] % 2: # Cor de first nesta partida
+                    wins += 1
+                else:
+                    losses += 1
+                if log is not None:
+                    log.write(json.dumps(record) + '\n')
+                    log.flush()
+                if progress is not None:
+                    progress(done, wins, draws, losses)
+    finally:
+        if log is not None:
+            log.close()
+    return wins, draws, losses
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Torneio entre duas versões da IA do Jogo de Damas.')
+    parser.add_argument('first', help='especificação do primeiro jogador (ex.: "search:time=100")')
+    parser.add_argument('second', help='especificação do segundo jogador (ex.: greedy)')
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--opening', type=int, default=DEFAULT_OPENING_PLIES, help='turnos aleatórios de abertura')
+    parser.add_argument('--max-plies', type=int, default=DEFAULT_MAX_PLIES, help='turnos até o empate')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help='arquivo para os registros das partidas (JSON por linha)')
+    args = parser.parse_args()
+    for spec in (args.first, args.second):
+        parse_spec(spec) # Falha aqui, e não nos processos, se a especificação for inválida
+
+    def report(done, wins, draws, losses):
+        if done % 10 == 0 or done == args.games:
+            print('%d/%d partidas: +%d =%d -%d' % (done, args.games, wins, draws, losses))
+
+    wins, draws, losses = run(args.first, args.second, args.games, args.workers, args.opening,
+                              args.max_plies, args.seed, args.out, report)
+    score, difference, margin, los = elo_summary(wins, draws, losses)
+    print('%s contra %s' % (args.first, args.second))
+    print('Placar: +%d =%d -%d (%.1f%%)' % (wins, draws, losses, 100 * score))
+    print('Elo: %+.0f ± %.0f   LOS: %.1f%%' % (difference, margin, 100 * los))
@@ -0,0 +1,120 @@
+"""
+Tabela de transposição da busca, com tamanho fixo.
+
+As entradas ficam em dois arrays de inteiros de 64 bits (chaves e dados
+compactados), agrupadas em baldes de duas entradas: a primeira guarda a busca
+mais profunda (substituída só por outra de profundidade maior ou igual) e a
+segunda é substituída sempre.
+"""
+
+from array import array
+
+DEFAULT_TT_MB = 16
+ENTRY_BYTES = 16  # Uma chave e um registro de dados, 8 bytes cada
+
+# Tipo do limite guardado com a pontuação
+EXACT, LOWER, UPPER = 1, 2, 3
+
+# Registro de dados: pontuação (20 bits, deslocada para ser positiva), tipo (2 bits),
+# profundidade (8 bits) e lance (20 bits, ver encode_turn)
+_SCORE_OFFSET = 1 << 19
+_SCORE_MASK = (1 << 20) - 1
+_FLAG_SHIFT = 20
+_DEPTH_SHIFT = 22
+_MOVE_SHIFT = 30
+_MOVE_MASK = (1 << 20) - 1
+
+
+def encode_turn(turn):
+    """
+    Código de 20 bits de um turno: origem, primeiro pouso, pouso final e número de casas
+    percorridas. Basta para reconhecer o turno entre os turnos legais da posição.
+    """
+    path = turn.path
+    return path[0] | path[1] << 5 | path[-1] << 10 | len(path) << 15
+
+
+class TranspositionTable:
+    """
+    Tabela de transposição de tamanho limitado a size_mb megabytes.
+    Contabiliza consultas com sucesso (hits) e sem sucesso (misses).
+    """
+
+    def __init__(self, size_mb=DEFAULT_TT_MB):
+        buckets = 1
+        while buckets * 2 * ENTRY_BYTES * 2 <= size_mb * 1024 * 1024:
+            buckets *= 2
+        self.size = buckets * 2  # Número de entradas (potência de 2)
+        self._bucket_mask = buckets - 1
+        self.keys = array('Q', bytes(8 * self.size))
+        self.data = array('Q', bytes(8 * self.size))
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def probe(self, key):
+        """
+        Procura a posição de chave key. Retorna (profundidade, tipo, pontuação, lance)
+        ou None. A pontuação é a guardada por store(), sem ajuste de distância da vitória.
+        """
+        index = (key & self._bucket_mask) << 1
+        keys = self.keys
+        if keys[index] == key:
+            data = self.data[index]
+        elif keys[index + 1] == key:
+            data = self.data[index + 1]
+        else:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return (
+            data >> _DEPTH_SHIFT & 0xFF,
+            data >> _FLAG_SHIFT & 3,
+            (data & _SCORE_MASK) - _SCORE_OFFSET,
+            data >> _MOVE_SHIFT & _MOVE_MASK,
+        )
+
+    def store(self, key, depth, flag, score, move):
+        """
+        Guarda o resultado da busca da posição key. move é o código do melhor turno
+        (encode_turn) ou 0. Substitui a entrada de profundidade se depth for maior ou
+        igual à guardada (ou se for a mesma posição); caso contrário, a segunda entrada.
+        """
+        index = (key & self._bucket_mask) << 1
+        keys = self.keys
+        data = self.data
+        if keys[index] != key and keys[index] and data[index] >> _DEPTH_SHIFT & 0xFF > depth:
+            index += 1 # Entrada mais profunda preservada: usa a de substituição sempre
+        keys[index] = key
+        data[index] = (
+            (score + _SCORE_OFFSET) & _SCORE_MASK
+            | flag << _FLAG_SHIFT
+            | min(depth, 0xFF) << _DEPTH_SHIFT
+            | move << _MOVE_SHIFT
+        )
+        self.stores += 1
+
+    def clear(self):
+        """Esvazia a tabela e zera as estatísticas."""
+        self.keys = array('Q', bytes(8 * self.size))
+        self.data = array('Q', bytes(8 * self.size))
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    @property
+    def hit_rate(self):
+        """Fração das consultas que encontraram a posição."""
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def stats(self):
+        """Estatísticas de uso: {'size', 'used', 'hits', 'misses', 'stores', 'hit_rate'}."""
+        return {
+            'size': self.size,
+            'used': self.size - self.keys.count(0),
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'hit_rate': self.hit_rate,
+        }
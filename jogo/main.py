@@ -1,57 +1,70 @@
 import pygame
 import sys
-from jogo import Game, show_winner, show_rules, show_credits
+from jogo import AI_PONDER, AI_WORKERS, PROFILE_FRAMES, FrameProfiler, Game, show_winner, show_rules, show_credits
 from menu_test import main_menu
 
 def run_game(display, clock, vs_computer=False):
     """Função para executar o jogo principal"""
-    game = Game(vs_computer=vs_computer)
+    game = Game(vs_computer=vs_computer, ai_workers=AI_WORKERS, ponder=AI_PONDER)
+    profiler = FrameProfiler() if PROFILE_FRAMES else None
+    if profiler is not None:
+        # As regras (jogadas e movimentos obrigatórios) rodam dentro das fases de eventos e da IA
+        profiler.instrument(game, 'make_move', 'update_mandatory_moves', 'check_winner', 'draw',
+                            'update_computer_turn')
     
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+    try:
+        while True:
+            if profiler is not None:
+                profiler.start_frame()
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    game.cancel_computer_search()
+                    pygame.quit()
+                    sys.exit()
+                
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        game.cancel_computer_search()
+                        return 'menu'  # Retorna ao menu com ESC
+                        
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    if event.button == 1:  # Botão esquerdo do mouse
+                        pos = pygame.mouse.get_pos()
+                        if pos[0] < 600:  # Verifica se o clique foi no tabuleiro
+                            game.evaluate_click(pos)
+            if profiler is not None:
+                profiler.mark('eventos')
             
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    return 'menu'  # Retorna ao menu com ESC
-                    
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:  # Botão esquerdo do mouse
-                    pos = pygame.mouse.get_pos()
-                    if pos[0] < 600:  # Verifica se o clique foi no tabuleiro
-                        game.evaluate_click(pos)
-        
-        # Verifica se é o turno do computador
-        if vs_computer and game._current_player_char == game.computer_player:
-            if game.ai_move_timer and pygame.time.get_ticks() >= game.ai_move_timer:
-                game.computer_move()
-            elif not game.ai_move_timer:
-                game.computer_move()
-        
-        # Desenha o jogo
-        display.fill((54, 54, 54))  # BG_COLOR
-        game.draw()
-        
-        # Verifica se o jogo terminou
-        winner = game.check_winner()
-        if winner is not None:
-            # Mostra a tela de vitória e espera pela ação do usuário
-            return show_winner(winner, display)
-        
-        pygame.display.update()
-        clock.tick(60)
-        
-        # Verifica se o jogo terminou
-        winner = game.check_winner()
-        if winner is not None:
-            show_winner(winner)
-            pygame.time.wait(2000)  # Pequena pausa antes de voltar ao menu
-            running = False
-        
-        pygame.display.update()
-        clock.tick(60)
+            # Verifica se é o turno do computador (a busca roda em segundo plano, sem travar a tela)
+            if vs_computer and game._current_player_char == game.computer_player:
+                game.update_computer_turn(pygame.time.get_ticks())
+            if profiler is not None:
+                profiler.mark('ia')
+            
+            # Verifica se o jogo terminou
+            winner = game.check_winner()
+            if profiler is not None:
+                profiler.mark('vencedor')
+            if winner is not None:
+                if profiler is not None:
+                    profiler.end_frame() # Antes de show_winner, que espera o jogador
+                game.cancel_computer_search() # Nada mais a buscar enquanto a tela de vitória espera
+                # Mostra a tela de vitória e espera pela ação do usuário
+                return show_winner(winner, display)
+            
+            # Desenha o jogo
+            display.fill((54, 54, 54))  # BG_COLOR
+            game.draw()
+            pygame.display.update()
+            if profiler is not None:
+                profiler.mark('desenho')
+            clock.tick(60)
+            if profiler is not None:
+                profiler.mark('espera')
+                profiler.end_frame()
+    finally:
+        if profiler is not None:
+            profiler.dump()
 
 def main():
     pygame.init()
@@ -0,0 +1,110 @@
+"""
+Velocidade das partidas simuladas: as regras originais (ReferenceGame) contra o motor
+sobre bitboards, em partidas aleatórias com o mesmo sorteio (um salto qualquer entre
+os permitidos) e o mesmo limite de turnos.
+
+    ReferenceGame   make_move da classe Game original, sobre a matriz 8x8
+    GameState       a mesma interface (mandatory_moves/make_move) sobre os bitboards
+    generate_moves  saltos sorteados com generate_moves/capture_moves e Position.move
+    generate_turns  turnos completos sorteados com Position.play
+
+Uso (a partir da pasta jogo/):
+    python tests/benchmark_rules.py --games 300
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from damas import GameState, Position, generate_turns  # noqa: E402
+from damas.movegen import capture_moves, generate_moves  # noqa: E402
+from reference_rules import ReferenceGame  # noqa: E402
+
+MAX_TURNS = 200  # Turnos até a partida ser declarada empatada, como DEFAULT_MAX_PLIES de tournament.py
+
+
+def play_interface(game_class, rng):
+    """Partida pela interface de Game: retorna os saltos jogados."""
+    game = game_class()
+    rand = rng.random
+    hops = 0
+    while game.status == 'Playing' and game.turn < MAX_TURNS:
+        moves = [(piece, dest, jumped) for piece, piece_moves in game.mandatory_moves.items()
+                 for dest, jumped in piece_moves]
+        if not moves:
+            break
+        piece, dest, jumped = moves[int(rand() * len(moves))]
+        game.make_move(game.players[game.turn % 2], piece, dest[0], dest[1], jumped)
+        hops += 1
+    return hops
+
+
+def play_turns(rng):
+    """Partida com turnos completos de generate_turns: retorna os saltos jogados."""
+    position = Position.initial()
+    rand = rng.random
+    hops = 0
+    for _ in range(MAX_TURNS):
+        turns = list(generate_turns(position))
+        if not turns:
+            break
+        turn = turns[int(rand() * len(turns))]
+        position.play(turn)
+        hops += len(turn.path) - 1
+    return hops
+
+
+def play_moves(rng):
+    """Partida salto a salto, como play_interface, direto sobre Position: retorna os saltos jogados."""
+    position = Position.initial()
+    rand = rng.random
+    hops = 0
+    for _ in range(MAX_TURNS):
+        moves = generate_moves(position)
+        if not moves:
+            break
+        while True:
+            origin, dest, captured = moves[int(rand() * len(moves))]
+            position.move(origin, dest, captured)
+            hops += 1
+            if captured is None:
+                break
+            moves = [(dest, next_dest, next_captured)
+                     for next_dest, next_captured in capture_moves(position, dest, position.side)]
+            if not moves:
+                break
+        position.side ^= 1
+    return hops
+
+
+def measure(play, games, seed=0):
+    """Saltos por segundo de play(rng) em games partidas."""
+    rng = random.Random(seed)
+    hops = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        hops += play(rng)
+    return hops / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compara a velocidade das regras originais e do motor.')
+    parser.add_argument('--games', type=int, default=300)
+    args = parser.parse_args()
+
+    contenders = (
+        ('ReferenceGame', lambda rng: play_interface(ReferenceGame, rng)),
+        ('GameState', lambda rng: play_interface(GameState, rng)),
+        ('generate_moves', play_moves),
+        ('generate_turns', play_turns),
+    )
+    baseline = None
+    for name, play in contenders:
+        speed = measure(play, args.games)
+        baseline = baseline or speed
+        print('%-15s %9.0f saltos/s  %5.1fx' % (name, speed, speed / baseline))
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Os testes importam o pacote damas a partir da pasta jogo/, como as ferramentas de linha de comando
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,295 @@
+"""
+Regras originais do jogo, sobre a matriz 8x8 de caracteres, usadas como referência
+nos testes e no benchmark das regras.
+
+ReferenceGame é a classe Game de main.py antes da troca pelos bitboards (ver
+damas/state.py), apenas com os métodos de regras e sem o pygame. Não deve ser
+"corrigida": qualquer diferença de comportamento em relação a ela é um erro do motor.
+"""
+
+
+class ReferenceGame:
+    def __init__(self, vs_computer=False):
+        self.status = 'Playing'
+        self.turn = 0  # Começa com o jogador humano (azul)
+        self.players = ('o', 'x')  # Azul primeiro, depois rosa
+        self.selected_piece = None
+        self.jumping = False # Flag para indicar se um salto múltiplo está em andamento
+        self.board = [
+            ['-', 'x', '-', 'x', '-', 'x', '-', 'x'],
+            ['x', '-', 'x', '-', 'x', '-', 'x', '-'],
+            ['-', 'x', '-', 'x', '-', 'x', '-', 'x'],
+            ['-', '-', '-', '-', '-', '-', '-', '-'],
+            ['-', '-', '-', '-', '-', '-', '-', '-'],
+            ['o', '-', 'o', '-', 'o', '-', 'o', '-'],
+            ['-', 'o', '-', 'o', '-', 'o', '-', 'o'],
+            ['o', '-', 'o', '-', 'o', '-', 'o', '-']
+        ]
+        # mandatory_moves armazenará: {pos_da_peca: [(pos_destino, pos_peca_capturada), ...]}
+        self.mandatory_moves = {}
+        self.update_mandatory_moves()
+        self.vs_computer = vs_computer
+        self.computer_player = 'x'  # O computador joga com as peças rosas ('x')
+        self._current_player_char = self.players[self.turn % 2] # Inicializa como atributo de instância
+        self.computer_turn_active = False # Nova flag para controlar o turno do computador
+        self.ai_move_timer = None # Timer para a jogada da IA
+
+    def update_mandatory_moves(self):
+        """
+        Atualiza o dicionário com todas as jogadas obrigatórias para o jogador atual.
+        Prioriza capturas. Se existirem capturas, apenas as jogadas de captura são obrigatórias.
+        Caso contrário, todos os movimentos normais são permitidos.
+        """
+        self.mandatory_moves = {}
+        current_player_char = self.players[self.turn % 2]
+        has_captures_overall = False
+
+        # Primeiro, encontra todas as capturas possíveis para o jogador atual em todo o tabuleiro
+        all_possible_captures = [] # Armazena (pos_destino, pos_peca_capturada, pos_peca_inicial)
+        for row in range(8):
+            for col in range(8):
+                piece = self.board[row][col]
+                if piece.lower() == current_player_char:
+                    piece_captures = self._get_capture_moves((row, col), self.board, current_player_char)
+                    if piece_captures:
+                        all_possible_captures.extend(piece_captures)
+                        has_captures_overall = True
+
+        if has_captures_overall:
+            # Se existirem capturas, apenas elas são permitidas. Popula mandatory_moves com movimentos de captura.
+            for dest_pos, jumped_pos, start_pos in all_possible_captures:
+                if start_pos not in self.mandatory_moves:
+                    self.mandatory_moves[start_pos] = []
+                self.mandatory_moves[start_pos].append((dest_pos, jumped_pos))
+        else:
+            # Se não houver capturas, permite movimentos normais
+            for row in range(8):
+                for col in range(8):
+                    piece = self.board[row][col]
+                    if piece.lower() == current_player_char:
+                        normal_moves = self._get_normal_moves((row, col), self.board, current_player_char)
+                        if normal_moves:
+                            # Para movimentos normais, não há peça capturada, então usa None
+                            if (row, col) not in self.mandatory_moves:
+                                self.mandatory_moves[(row, col)] = []
+                            for move in normal_moves:
+                                self.mandatory_moves[(row, col)].append((move, None))
+
+    def _get_capture_moves(self, piece_pos, board, player_to_check):
+        """
+        Função auxiliar para obter todos os movimentos de captura possíveis para uma dada peça
+        em um dado tabuleiro.
+        Retorna uma lista de tuplas: (pos_destino, pos_peca_capturada, pos_peca_inicial).
+        """
+        capture_list = []
+        row, col = piece_pos
+        piece_type = board[row][col]
+        opponent_char = 'x' if player_to_check == 'o' else 'o'
+
+        if piece_type.islower(): # Peça regular
+            directions = []
+            if player_to_check == 'o': # Peças azuis movem para cima
+                directions = [(-1, -1), (-1, 1)]
+            else: # Peças rosas movem para baixo
+                directions = [(1, -1), (1, 1)]
+
+            for dr, dc in directions:
+                # Verifica a peça do oponente a um passo de distância
+                new_row, new_col = row + dr, col + dc
+                # Verifica o quadrado vazio a dois passos de distância (local de aterrissagem)
+                jump_row, jump_col = row + 2 * dr, col + 2 * dc
+
+                if (0 <= new_row < 8 and 0 <= new_col < 8 and
+                    board[new_row][new_col].lower() == opponent_char and
+                    0 <= jump_row < 8 and 0 <= jump_col < 8 and
+                    board[jump_row][jump_col] == '-'):
+                    capture_list.append(([jump_row, jump_col], (new_row, new_col), piece_pos))
+        else: # Peça Dama (maiúscula)
+            directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)] # Damas podem mover em todas as direções
+            for dr, dc in directions:
+                r, c = row + dr, col + dc
+                potential_captured_piece_pos = None
+                while 0 <= r < 8 and 0 <= c < 8:
+                    if board[r][c].lower() == player_to_check:
+                        break # Bateu na própria peça, não pode pular
+                    if board[r][c].lower() == opponent_char:
+                        if potential_captured_piece_pos: # Já encontrou uma peça para pular
+                            break # Não pode pular duas peças em um único movimento
+                        potential_captured_piece_pos = (r, c)
+                    elif board[r][c] == '-' and potential_captured_piece_pos:
+                        # Quadrado vazio após uma peça capturada, este é o local de aterrissagem válido
+                        capture_list.append(([r, c], potential_captured_piece_pos, piece_pos))
+                    elif board[r][c] == '-' and not potential_captured_piece_pos:
+                        pass # Quadrado vazio, continua procurando por uma peça do oponente
+                    else: # Bateu em uma peça inválida (ex: outra peça do oponente atrás da primeira)
+                        break
+                    r += dr
+                    c += dc
+        return capture_list
+
+    def _get_normal_moves(self, piece_pos, board, player_to_check):
+        """
+        Função auxiliar para obter todos os movimentos normais (não de captura) para uma dada peça
+        em um dado tabuleiro.
+        Retorna uma lista de pos_destino.
+        """
+        normal_moves_list = []
+        row, col = piece_pos
+        piece_type = board[row][col]
+
+        if piece_type.islower(): # Peça regular
+            directions = []
+            if player_to_check == 'o': # Peças azuis movem para cima
+                directions = [(-1, -1), (-1, 1)]
+            else: # Peças rosas movem para baixo
+                directions = [(1, -1), (1, 1)]
+
+            for dr, dc in directions:
+                new_row, new_col = row + dr, col + dc
+                if 0 <= new_row < 8 and 0 <= new_col < 8 and board[new_row][new_col] == '-':
+                    normal_moves_list.append([new_row, new_col])
+        else: # Peça Dama
+            directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)] # Damas podem mover em todas as direções
+            for dr, dc in directions:
+                r, c = row + dr, col + dc
+                while 0 <= r < 8 and 0 <= c < 8 and board[r][c] == '-':
+                    normal_moves_list.append([r, c])
+                    r += dr
+                    c += dc
+        return normal_moves_list
+
+    def is_valid_move(self, player_char, piece_pos, dest_row, dest_col):
+        """
+        Verifica se um movimento de piece_pos para (dest_row, dest_col) é válido
+        de acordo com os movimentos obrigatórios atuais.
+        Retorna (True, pos_peca_capturada) se válido, (False, None) caso contrário.
+        """
+        start_row, start_col = piece_pos
+        start_pos_tuple = (start_row, start_col)
+
+        # Verifica se a peça selecionada é sequer permitida para mover
+        if start_pos_tuple not in self.mandatory_moves:
+            return False, None
+
+        # Verifica se o destino é um dos movimentos permitidos para esta peça
+        for allowed_dest, jumped_piece_pos in self.mandatory_moves[start_pos_tuple]:
+            if allowed_dest[0] == dest_row and allowed_dest[1] == dest_col:
+                return True, jumped_piece_pos # Esta é a peça capturada específica para este movimento
+        return False, None
+
+    def get_possible_moves(self, piece_pos):
+        """
+        Retorna uma lista de posições de destino válidas para a dada piece_pos,
+        com base nos mandatory_moves atuais do jogo.
+        Retorna uma tupla: (lista de pos_destino, booleano indicando se há saltos envolvidos)
+        Isso é principalmente para desenhar destaques.
+        """
+        piece_pos_tuple = (piece_pos[0], piece_pos[1]) # Correção: alterado de 'piece[1]' para 'piece_pos[1]'
+        if piece_pos_tuple in self.mandatory_moves:
+            destinations = [move[0] for move in self.mandatory_moves[piece_pos_tuple]]
+            # Verifica se algum dos movimentos é um salto (ou seja, jumped_piece_pos não é None)
+            is_jump_possible = any(move[1] is not None for move in self.mandatory_moves[piece_pos_tuple])
+            return destinations, is_jump_possible
+        return [], False
+
+    def make_move(self, player_char, piece_pos, dest_row, dest_col, jumped_piece_pos=None):
+        """
+        Executa um movimento no tabuleiro.
+        Lida com o movimento da peça, captura de peça e promoção a dama.
+        Verifica saltos consecutivos.
+        """
+        start_row, start_col = piece_pos
+        piece = self.board[start_row][start_col]
+
+        self.board[dest_row][dest_col] = piece
+        self.board[start_row][start_col] = '-'
+
+        if jumped_piece_pos:
+            self.board[jumped_piece_pos[0]][jumped_piece_pos[1]] = '-'
+
+        # Promove a dama se atingir a extremidade oposta
+        if (player_char == 'o' and dest_row == 0) or \
+           (player_char == 'x' and dest_row == 7):
+            self.board[dest_row][dest_col] = piece.upper()
+
+        # Verifica saltos consecutivos com a mesma peça
+        if jumped_piece_pos: # Se um salto acabou de ocorrer
+            # Reavalia as capturas especificamente para a peça que acabou de se mover para sua nova posição
+            re_evaluated_captures = self._get_capture_moves((dest_row, dest_col), self.board, player_char)
+            if re_evaluated_captures:
+                # Se houver mais capturas para esta peça, mantém o turno do mesmo jogador
+                self.selected_piece = [dest_row, dest_col] # Mantém a peça selecionada
+                self.jumping = True
+                # Atualiza mandatory_moves *apenas* para esta peça para o próximo clique
+                self.mandatory_moves = {(dest_row, dest_col): [(m[0], m[1]) for m in re_evaluated_captures]}
+                return # Permanece no mesmo turno, aguardando o próximo salto
+            else:
+                self.jumping = False # Não há mais saltos para esta peça
+
+        # Se nenhum salto ocorreu, ou não há mais saltos disponíveis, termina o turno
+        self.selected_piece = None
+        self.jumping = False
+        self.next_turn()
+
+        winner = self.check_winner()
+        if winner is not None:
+            self.status = 'Game Over' # Atualiza o status do jogo
+
+    def next_turn(self):
+        """Avança o turno para o próximo jogador e atualiza os movimentos obrigatórios."""
+        self.turn += 1
+        self._current_player_char = self.players[self.turn % 2] # Atualiza o atributo de instância
+        self.update_mandatory_moves()
+        self.computer_turn_active = False # Sem o computador: a partida de referência é sempre entre humanos
+        self.ai_move_timer = None
+
+    def check_winner(self):
+        """
+        Verifica se há um vencedor ou um empate.
+        Retorna 'o' se o azul vencer, 'x' se o rosa vencer, 'tie' se for um empate, None caso contrário.
+        """
+        pink_count = sum(row.count('x') + row.count('X') for row in self.board)
+        blue_count = sum(row.count('o') + row.count('O') for row in self.board)
+
+        if pink_count == 0:
+            return 'o' # Azul vence (todas as peças rosas capturadas)
+        if blue_count == 0:
+            return 'x' # Rosa vence (todas as peças azuis capturadas)
+
+        # Se o jogador atual não tiver movimentos válidos, ele perde
+        if not self.has_possible_move():
+            if self.players[self.turn % 2] == 'o':
+                return 'x' # Azul não tem movimentos, Rosa vence
+            else:
+                return 'o' # Rosa não tem movimentos, Azul vence
+
+        return None # Nenhum vencedor ainda
+
+    def has_possible_move(self):
+        """
+        Verifica se o jogador atual tem algum movimento possível (normal ou de captura).
+        Isso é usado para determinar se um jogador está em xeque-mate.
+        """
+        # Se self.mandatory_moves não estiver vazio, significa que há movimentos disponíveis para o jogador atual
+        return bool(self.mandatory_moves)
+
+    def is_position_safe(self, pos, board, current_player_char):
+        """
+        Verifica se uma dada posição (pos) no tabuleiro é segura para a peça
+        pertencente a current_player_char. Uma posição é insegura se uma peça
+        do oponente puder capturá-la em seu próximo turno.
+        """
+        row, col = pos
+        opponent_char = 'x' if current_player_char == 'o' else 'o'
+
+        # Itera por todas as peças do oponente no tabuleiro
+        for r_op in range(8):
+            for c_op in range(8):
+                piece_op = board[r_op][c_op]
+                if piece_op.lower() == opponent_char:
+                    # Verifica se esta peça do oponente pode capturar a peça em 'pos'
+                    opponent_captures = self._get_capture_moves((r_op, c_op), board, opponent_char)
+                    for dest_op, jumped_op, _ in opponent_captures:
+                        if jumped_op == (row, col): # Se o oponente puder pular *minha* peça em (row,col)
+                            return False # Posição não é segura
+        return True
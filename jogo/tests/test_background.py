@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+
+from damas import GameState, Position, Searcher
+from damas.background import BackgroundSearch, PonderSearch
+from damas.parallel import ParallelSearcher
+
+LONG_SEARCH_MS = 5000
+
+
+@pytest.fixture(params=['serial', 'parallel'])
+def searcher(request):
+    if request.param == 'serial':
+        yield Searcher(tt_mb=1)
+    else:
+        with ParallelSearcher(workers=2, tt_mb=1) as parallel:
+            yield parallel
+
+
+def test_ponder_stop_does_not_block(searcher):
+    ponder = PonderSearch(searcher, Position.initial(), LONG_SEARCH_MS)
+    time.sleep(0.2) # Deixa a primeira busca começar
+    start = time.perf_counter()
+    ponder.stop()
+    assert time.perf_counter() - start < 0.005
+    # A busca interrompida termina logo, e não ao fim do seu tempo
+    ponder.wait(timeout=1)
+    assert not ponder._thread.is_alive()
+
+
+def test_search_after_stopped_ponder(searcher):
+    ponder = PonderSearch(searcher, Position.initial(), LONG_SEARCH_MS)
+    time.sleep(0.2)
+    ponder.stop()
+    search = BackgroundSearch(searcher, Position.initial(), 100, after=ponder)
+    result = search.wait(timeout=2)
+    assert result is not None and result.depth >= 1 # O cancelamento do pondering não vale para ela
+
+
+def test_ponders_from_the_first_move():
+    state = GameState(vs_computer=True, ponder=True)
+    try:
+        assert state._ponder_search is not None
+        piece, moves = sorted(state.mandatory_moves.items())[0]
+        (dest_row, dest_col), jumped = moves[0]
+        state.make_move('o', piece, dest_row, dest_col, jumped)
+        assert state.ponder_hits + state.ponder_misses == 1
+    finally:
+        state.cancel_computer_search()
+
+
+def test_cancel_before_search_starts(searcher):
+    ponder = PonderSearch(searcher, Position.initial(), LONG_SEARCH_MS)
+    time.sleep(0.2)
+    search = BackgroundSearch(searcher, Position.initial(), LONG_SEARCH_MS, after=ponder)
+    search.cancel() # Ainda esperando o pondering: o pedido vale quando ela começar
+    ponder.stop()
+    assert search.wait(timeout=1) is None
+    assert not search.running
+
+
+def test_search_honours_cancel_set_before_it_starts(searcher):
+    cancel = threading.Event()
+    cancel.set()
+    start = time.perf_counter()
+    result = searcher.search(Position.initial(), LONG_SEARCH_MS, cancel=cancel)
+    assert time.perf_counter() - start < 1
+    assert result.turn is not None
+
+
+def test_new_search_waits_for_cancelled_one():
+    state = GameState(vs_computer=True)
+    state.book = None
+    state.computer_player = 'o' # Vez do computador já na posição inicial
+    state.start_turn()
+    state.ai_time_limit_ms = LONG_SEARCH_MS
+    try:
+        state.start_computer_search()
+        cancelled = state._background_search
+        time.sleep(0.2)
+        state.cancel_computer_search()
+        assert state._previous_search is cancelled
+        state.ai_time_limit_ms = 100
+        state.start_computer_search()
+        assert state._background_search.wait(timeout=2) is not None
+        assert not cancelled.running # A busca nova só começou depois que a cancelada terminou
+    finally:
+        state.cancel_computer_search()
+
+
+def test_no_pondering_after_game_over():
+    state = GameState(vs_computer=True, ponder=True)
+    state.computer_player = 'o' # O computador (azul) captura a última peça rosa, e a vez seria do humano
+    try:
+        state.load_position(Position(1 << 8, 1 << 5, 0, 0))
+        piece, moves = next(iter(state.mandatory_moves.items()))
+        (dest_row, dest_col), jumped = moves[0]
+        state.make_move('o', piece, dest_row, dest_col, jumped)
+        assert state.status == 'Game Over'
+        assert state._ponder_search is None
+    finally:
+        state.cancel_computer_search()
@@ -0,0 +1,23 @@
+from damas import Position, Searcher
+from damas.book import _candidates
+from damas.movegen import generate_turns
+
+
+class _InterruptedSearcher(Searcher):
+    """Searcher cuja busca é interrompida antes de completar alguma iteração."""
+
+    def iterate(self, *args, **kwargs):
+        return []
+
+
+def test_candidates_without_completed_iterations():
+    position = Position.initial()
+    candidates = _candidates(position, _InterruptedSearcher(tt_mb=1), depth=4, margin=30)
+    assert candidates
+    assert len(candidates) <= len(list(generate_turns(position)))
+    assert position.key == Position.initial().key # A posição é restaurada
+
+
+def test_candidates_without_turns():
+    position = Position(1 << 8, 0, 0, 1) # O rosa, a jogar, não tem peças
+    assert _candidates(position, Searcher(tt_mb=1), depth=4, margin=30) == []
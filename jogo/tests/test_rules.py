@@ -0,0 +1,194 @@
+"""
+Testes diferenciais: o motor sobre bitboards (GameState e generate_turns)
+contra as regras originais sobre a matriz 8x8 (reference_rules.ReferenceGame).
+"""
+
+import copy
+import random
+
+import pytest
+
+from damas import GameState, Position, generate_turns, square_of
+from damas.bitboard import PLAYERS
+from reference_rules import ReferenceGame
+
+GAMES = 60
+MAX_HOPS = 300
+
+
+def normalized_moves(mandatory_moves):
+    """mandatory_moves com todas as casas como tuplas, para comparar as duas implementações."""
+    return {
+        tuple(piece): sorted((tuple(dest), tuple(jumped) if jumped else None) for dest, jumped in moves)
+        for piece, moves in mandatory_moves.items()
+    }
+
+
+def reference_game(rows, side):
+    game = ReferenceGame()
+    game.board = [list(row) for row in rows]
+    game.turn = side
+    game._current_player_char = PLAYERS[side]
+    game.update_mandatory_moves()
+    return game
+
+
+def game_state(rows, side):
+    state = GameState()
+    state.load_position(Position.from_rows(rows, side))
+    return state
+
+
+def reference_turns(game):
+    """Turnos completos da referência, como (caminho em casas, capturadas em casas, promove)."""
+    turns = set()
+    player = PLAYERS[game.turn % 2]
+
+    def extend(game, path, captured, was_man):
+        for piece, moves in game.mandatory_moves.items():
+            for dest, jumped in moves:
+                child = copy.deepcopy(game)
+                child.make_move(player, piece, dest[0], dest[1], jumped)
+                child_path = path + (square_of(*dest),)
+                child_captured = captured + ((square_of(*jumped),) if jumped else ())
+                if child.jumping:
+                    extend(child, child_path, child_captured, was_man)
+                else:
+                    turns.add((child_path, child_captured, was_man and child.board[dest[0]][dest[1]].isupper()))
+
+    for piece in list(game.mandatory_moves):
+        single = copy.deepcopy(game)
+        single.mandatory_moves = {piece: game.mandatory_moves[piece]}
+        extend(single, (square_of(*piece),), (), game.board[piece[0]][piece[1]].islower())
+    return turns
+
+
+def random_positions(count, seed=0):
+    """Posições variadas: tiradas de partidas aleatórias, com e sem damas."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        position = Position.initial()
+        for _ in range(rng.randint(0, 60)):
+            turns = list(generate_turns(position))
+            if not turns:
+                break
+            position.play(rng.choice(turns))
+        positions.append(position)
+        # Uma posição só de damas, em casas sorteadas
+        squares = rng.sample(range(32), rng.randint(2, 8))
+        half = len(squares) // 2
+        blue = sum(1 << sq for sq in squares[:half])
+        pink = sum(1 << sq for sq in squares[half:])
+        kings = sum(1 << sq for sq in squares if rng.random() < 0.7)
+        positions.append(Position(blue, pink, kings, rng.randint(0, 1)))
+    return positions
+
+
+@pytest.mark.parametrize('seed', range(GAMES))
+def test_random_games_match_reference(seed):
+    """Mesmos saltos sorteados nas duas implementações: movimentos, tabuleiro, vencedor e chave a cada salto."""
+    rng = random.Random(seed)
+    reference, state = ReferenceGame(), GameState()
+    for _ in range(MAX_HOPS):
+        assert normalized_moves(state.mandatory_moves) == normalized_moves(reference.mandatory_moves)
+        assert state.board == reference.board
+        assert (state.turn, state.jumping, state.status) == (reference.turn, reference.jumping, reference.status)
+        assert state.check_winner() == reference.check_winner()
+        assert state.key == Position.from_rows(reference.board, reference.turn % 2).key
+        if reference.status != 'Playing' or not reference.mandatory_moves:
+            break
+        piece, moves = rng.choice(sorted(normalized_moves(reference.mandatory_moves).items()))
+        (dest_row, dest_col), jumped = rng.choice(moves)
+        player = PLAYERS[reference.turn % 2]
+        reference.make_move(player, piece, dest_row, dest_col, jumped)
+        state.make_move(player, piece, dest_row, dest_col, jumped)
+
+
+def test_turns_match_reference():
+    for position in random_positions(150):
+        rows = position.to_rows()
+        expected = reference_turns(reference_game(rows, position.side))
+        turns = {(turn.path, turn.captured, turn.promotes) for turn in generate_turns(position)}
+        assert turns == expected, rows
+
+
+@pytest.mark.parametrize('rows, side, move, expected_row', [
+    # Pedra azul chega à primeira linha
+    (('--------', 'o-------', '-----x--', '--------', '--------', '--------', '--------', '--------'),
+     0, ((1, 0), (0, 1), None), '-O------'),
+    # Pedra rosa chega à última linha capturando
+    (('-------x', '--------', '--------', '--------', '-------o', '--x-----', '-o------', '--------'),
+     1, ((5, 2), (7, 0), (6, 1)), 'X-------'),
+])
+def test_promotion_matches_reference(rows, side, move, expected_row):
+    (piece, (dest_row, dest_col), jumped) = move
+    reference, state = reference_game(rows, side), game_state(rows, side)
+    for game in (reference, state):
+        game.make_move(PLAYERS[side], piece, dest_row, dest_col, jumped)
+    assert ''.join(state.board[dest_row]) == expected_row
+    assert state.board == reference.board
+    assert normalized_moves(state.mandatory_moves) == normalized_moves(reference.mandatory_moves)
+    assert state.king_count[PLAYERS[side]] == 1
+
+
+def test_promoted_man_keeps_capturing_as_king():
+    rows = ('--------', '--------', '--------', '--------', '-----o--', '--x---o-', '---o---x', 'o-------')
+    reference, state = reference_game(rows, 1), game_state(rows, 1)
+    assert normalized_moves(state.mandatory_moves) == normalized_moves(reference.mandatory_moves)
+    for game in (reference, state):
+        game.make_move('x', (5, 2), 7, 4, (6, 3))
+    assert state.jumping and reference.jumping
+    assert state.board == reference.board
+    assert normalized_moves(state.mandatory_moves) == normalized_moves(reference.mandatory_moves)
+
+
+def test_is_position_safe_matches_reference():
+    reference, state = ReferenceGame(), GameState()
+    for position in random_positions(60, seed=1):
+        rows = position.to_rows()
+        for row in range(8):
+            for col in range(8):
+                if rows[row][col] == '-':
+                    continue
+                player = rows[row][col].lower()
+                assert (state.is_position_safe((row, col), rows, player)
+                        == reference.is_position_safe((row, col), rows, player))
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_apply_undo_round_trip(seed):
+    rng = random.Random(seed)
+    state = GameState()
+    snapshots = []
+    for _ in range(rng.randint(10, 80)):
+        if not state.mandatory_moves:
+            break
+        snapshots.append((
+            [row[:] for row in state.board], state.key, state.position.piece_hash, dict(state.men_count),
+            dict(state.king_count), copy.deepcopy(state.piece_squares), state.turn, state.jumping,
+            normalized_moves(state.mandatory_moves),
+        ))
+        piece, moves = rng.choice(sorted(state.mandatory_moves.items()))
+        dest, jumped = rng.choice(moves)
+        _, continues = state.apply_move(piece, dest, jumped)
+        if continues:
+            state.mandatory_moves = {dest: state._piece_capture_moves(square_of(*dest))}
+        else:
+            state.update_mandatory_moves()
+        assert state.position.piece_hash == state.position.compute_piece_hash()
+    while snapshots:
+        board, key, piece_hash, men, kings, piece_squares, turn, jumping, moves = snapshots.pop()
+        state.undo_move()
+        if state.jumping:
+            selected = tuple(state.selected_piece)
+            state.mandatory_moves = {selected: state._piece_capture_moves(square_of(*selected))}
+        else:
+            state.update_mandatory_moves()
+        assert state.board == board
+        assert (state.key, state.position.piece_hash) == (key, piece_hash)
+        assert (state.men_count, state.king_count) == (men, kings)
+        assert state.piece_squares == piece_squares
+        assert (state.turn, state.jumping) == (turn, jumping)
+        assert normalized_moves(state.mandatory_moves) == moves
+
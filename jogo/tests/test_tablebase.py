@@ -0,0 +1,37 @@
+from damas import GameState, Position
+from damas.tablebase import DRAW, LOSS, MAX_DISTANCE, WIN, decode_value, encode_value
+
+
+def test_value_round_trip():
+    assert decode_value(encode_value(DRAW, 0)) == (DRAW, 0)
+    for distance in range(MAX_DISTANCE + 1):
+        result = WIN if distance % 2 else LOSS
+        value = encode_value(result, distance)
+        assert 0 < value < 256
+        assert decode_value(value) == (result, distance)
+
+
+def test_long_distances_keep_the_result():
+    for distance in range(MAX_DISTANCE + 1, MAX_DISTANCE + 10):
+        result = WIN if distance % 2 else LOSS
+        value = encode_value(result, distance)
+        assert value < 256
+        decoded_result, decoded_distance = decode_value(value)
+        assert decoded_result == result
+        assert decoded_distance in (MAX_DISTANCE - 1, MAX_DISTANCE)
+
+
+class _DrawTablebase:
+    """Tablebase que declara empate em toda posição."""
+
+    def probe(self, position):
+        return DRAW, 0
+
+
+def test_no_tie_in_the_middle_of_a_capture():
+    state = GameState()
+    state.tablebase = _DrawTablebase()
+    state.load_position(Position(1 << 0, 1 << 31, 1 << 0 | 1 << 31, 0)) # Só damas
+    assert state.check_winner() == 'tie'
+    state.jumping = True # A sequência de capturas ainda não terminou
+    assert state.check_winner() is None